@@ -29,6 +29,31 @@ class Grafo(ABC):
         pass
 
 
+# =============================
+# Lotes transacionais
+# =============================
+def _agrupar_lote(indice, adicoes, remocoes):
+    """
+    Valida todos os rótulos de um lote antes de qualquer alteração (KeyError
+    se algum não existir) e agrupa o lote por par (i, j), i <= j:
+    {(i, j): [inserções, remoções]}. Em aplicar_lote as remoções vêm antes
+    das inserções e cada par é resolvido uma única vez.
+    """
+    pares = {}
+    for arestas, k in ((adicoes, 0), (remocoes, 1)):
+        for u, v in arestas:
+            if u not in indice or v not in indice:
+                raise KeyError(u if u not in indice else v)
+            i, j = indice[u], indice[v]
+            if i > j:
+                i, j = j, i
+            c = pares.get((i, j))
+            if c is None:
+                c = pares[(i, j)] = [0, 0]
+            c[k] += 1
+    return pares
+
+
 # =============================
 # Grafo Denso (Matriz de Adjacência)
 # =============================
@@ -40,6 +65,7 @@ class GrafoDenso(Grafo):
         """
         self.rotulos = rotulos
         self.n = len(rotulos)
+        self.indice = {r: i for i, r in enumerate(rotulos)}   # rótulo -> linha da matriz
         self.matriz = [[0 for _ in range(self.n)] for _ in range(self.n)]
         self.arestas = 0
 
@@ -53,19 +79,69 @@ class GrafoDenso(Grafo):
         return [sum(self.matriz[i]) for i in range(self.n)]
 
     def adicionar_aresta(self, u, v):
-        i, j = self.rotulos.index(u), self.rotulos.index(v)
+        i, j = self.indice[u], self.indice[v]
         if self.matriz[i][j] == 0:   # evita aresta duplicada
             self.matriz[i][j] = 1
             self.matriz[j][i] = 1
             self.arestas += 1
 
+    def adicionar_arestas(self, arestas):
+        """
+        Insere várias arestas de uma vez (qualquer iterável de pares).
+        Mesmo efeito de chamar adicionar_aresta para cada par, numa só passada.
+        """
+        indice, matriz = self.indice, self.matriz
+        for u, v in arestas:
+            i, j = indice[u], indice[v]
+            linha = matriz[i]
+            if linha[j] == 0:
+                linha[j] = 1
+                matriz[j][i] = 1
+                self.arestas += 1   # a cada aresta: um rótulo inválido adiante não deixa a contagem para trás
+
     def remover_aresta(self, u, v):
-        i, j = self.rotulos.index(u), self.rotulos.index(v)
+        i, j = self.indice[u], self.indice[v]
         if self.matriz[i][j] == 1:
             self.matriz[i][j] = 0
             self.matriz[j][i] = 0
             self.arestas -= 1
 
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        """
+        Remove e insere um lote de arestas como uma transação: rótulos
+        inválidos abortam antes de qualquer mudança e uma falha durante a
+        escrita desfaz o que já foi escrito. As células são escritas em
+        ordem de linha e o contador de arestas é atualizado uma vez.
+        Retorna (arestas inseridas, arestas removidas).
+        """
+        matriz = self.matriz
+        escritas = []   # (linha, coluna, valor)
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = matriz[i][j]
+            k = min(r, m)
+            depois = 1 if a else m - k   # sem arestas duplicadas
+            inseridas += depois - (m - k)
+            removidas += k
+            if depois != m:
+                escritas.append((i, j, depois))
+                if i != j:
+                    escritas.append((j, i, depois))
+        escritas.sort()
+        antigas = []
+        try:
+            for i, j, valor in escritas:
+                linha = matriz[i]
+                antiga = linha[j]
+                linha[j] = valor
+                antigas.append((linha, j, antiga))
+        except BaseException:
+            for linha, j, valor in reversed(antigas):
+                linha[j] = valor
+            raise
+        self.arestas += inseridas - removidas
+        return inseridas, removidas
+
     def imprimir(self):
         print("Matriz de Adjacência:")
         print("   " + " ".join(self.rotulos))
@@ -74,6 +150,111 @@ class GrafoDenso(Grafo):
             print(f"{self.rotulos[i]}: {linha}")
 
 
+# =============================
+# Grafo Denso com Bits (Matriz de Adjacência compactada)
+# =============================
+try:
+    _popcount = int.bit_count   # Python 3.10+
+except AttributeError:
+    def _popcount(x):
+        return bin(x).count("1")
+
+
+class GrafoDensoBits(Grafo):
+    def __init__(self, rotulos):
+        """
+        Grafo denso simples com a matriz de adjacência guardada em bits:
+        cada linha é um inteiro em que o bit j indica a aresta (i, j).
+        Ocupa cerca de 1 bit por célula em vez de um ponteiro de 8 bytes.
+        """
+        self.rotulos = rotulos
+        self.n = len(rotulos)
+        self.indice = {r: i for i, r in enumerate(rotulos)}
+        self.linhas = [0] * self.n
+        self.arestas = 0
+
+    def numero_de_vertices(self):
+        return self.n
+
+    def numero_de_arestas(self):
+        return self.arestas
+
+    def sequencia_de_graus(self):
+        return [_popcount(linha) for linha in self.linhas]
+
+    def adicionar_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        if not self.linhas[i] >> j & 1:   # evita aresta duplicada
+            self.linhas[i] |= 1 << j
+            self.linhas[j] |= 1 << i
+            self.arestas += 1
+
+    def adicionar_arestas(self, arestas):
+        for u, v in arestas:
+            self.adicionar_aresta(u, v)
+
+    def remover_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        if self.linhas[i] >> j & 1:
+            self.linhas[i] &= ~(1 << j)
+            self.linhas[j] &= ~(1 << i)
+            self.arestas -= 1
+
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        """
+        Mesmo contrato de GrafoDenso.aplicar_lote. Os bits a ligar e a
+        desligar são juntados em máscaras por linha, e cada linha afetada é
+        reescrita uma única vez.
+        """
+        linhas = self.linhas
+        ligar, desligar = {}, {}
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = linhas[i] >> j & 1
+            k = min(r, m)
+            depois = 1 if a else m - k
+            inseridas += depois - (m - k)
+            removidas += k
+            if depois != m:
+                mascaras = ligar if depois else desligar
+                mascaras[i] = mascaras.get(i, 0) | 1 << j
+                mascaras[j] = mascaras.get(j, 0) | 1 << i
+        antigas = {}
+        try:
+            for i in ligar.keys() | desligar.keys():
+                antigas[i] = linhas[i]
+                linhas[i] = linhas[i] & ~desligar.get(i, 0) | ligar.get(i, 0)
+        except BaseException:
+            for i, linha in antigas.items():
+                linhas[i] = linha
+            raise
+        self.arestas += inseridas - removidas
+        return inseridas, removidas
+
+    def tem_aresta(self, u, v):
+        return bool(self.linhas[self.indice[u]] >> self.indice[v] & 1)
+
+    def vizinhos_em_comum(self, u, v):
+        # interseção das vizinhanças com um AND entre as duas linhas
+        comum = self.linhas[self.indice[u]] & self.linhas[self.indice[v]]
+        return [self.rotulos[j] for j in range(self.n) if comum >> j & 1]
+
+    def numero_de_vizinhos_em_comum(self, u, v):
+        return _popcount(self.linhas[self.indice[u]] & self.linhas[self.indice[v]])
+
+    def is_completo(self):
+        # cada linha deve ter todos os bits ligados, menos o da diagonal
+        cheia = (1 << self.n) - 1
+        return all(linha == cheia ^ (1 << i) for i, linha in enumerate(self.linhas))
+
+    def imprimir(self):
+        print("Matriz de Adjacência:")
+        print("   " + " ".join(self.rotulos))
+        for i in range(self.n):
+            linha = self.linhas[i]
+            print(f"{self.rotulos[i]}: " + " ".join("1" if linha >> j & 1 else "0" for j in range(self.n)))
+
+
 # =============================
 # Grafo Esparso (Lista de Adjacência)
 # =============================
@@ -85,6 +266,7 @@ class GrafoEsparso(Grafo):
         """
         self.rotulos = rotulos
         self.n = len(rotulos)
+        self.indice = {r: i for i, r in enumerate(rotulos)}
         self.adj = {rotulo: [] for rotulo in rotulos}
         self.arestas = 0
 
@@ -110,6 +292,66 @@ class GrafoEsparso(Grafo):
                 self.adj[v].remove(u)
                 self.arestas -= 1
 
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        """
+        Mesmo contrato de GrafoDenso.aplicar_lote (aqui arestas múltiplas
+        são permitidas). Ao contrário de adicionar_aresta, rótulos
+        desconhecidos não são ignorados: abortam o lote com KeyError. Cada
+        lista com remoções é refeita numa só passada.
+        """
+        rotulos, adj = self.rotulos, self.adj
+        tirar = {}   # vértice -> {vizinho: ocorrências a retirar}
+        por = {}     # vértice -> vizinhos a acrescentar
+        contagens = {}
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            u, v = rotulos[i], rotulos[j]
+            if r:
+                if u not in contagens:
+                    contagens[u] = {}
+                    for w in adj[u]:
+                        contagens[u][w] = contagens[u].get(w, 0) + 1
+                m = contagens[u].get(v, 0)
+                if u == v:
+                    m //= 2   # um laço aparece duas vezes na lista
+                k = min(r, m)
+                if k:
+                    t = tirar.setdefault(u, {})
+                    t[v] = t.get(v, 0) + k
+                    t = tirar.setdefault(v, {})
+                    t[u] = t.get(u, 0) + k
+                removidas += k
+            if a:
+                por.setdefault(u, []).extend([v] * a)
+                por.setdefault(v, []).extend([u] * a)
+                inseridas += a
+        novas = {}
+        for u, t in tirar.items():
+            nova = []
+            for w in adj[u]:
+                if t.get(w):
+                    t[w] -= 1
+                else:
+                    nova.append(w)
+            novas[u] = nova
+
+        trocadas, tamanhos = {}, {}
+        try:
+            for u, nova in novas.items():
+                trocadas[u] = adj[u]
+                adj[u] = nova
+            for u, ws in por.items():
+                tamanhos[u] = len(adj[u])
+                adj[u].extend(ws)
+        except BaseException:
+            for u, n in tamanhos.items():
+                del adj[u][n:]
+            for u, velha in trocadas.items():
+                adj[u] = velha
+            raise
+        self.arestas += inseridas - removidas
+        return inseridas, removidas
+
     def imprimir(self):
         print("Lista de Adjacência:")
         for v in self.rotulos:
@@ -141,6 +383,16 @@ if __name__ == "__main__":
     print("Sequência de graus:", grafo_denso.sequencia_de_graus())
 
 
+    print("\n===== TESTE GRAFO DENSO (BITS) =====")
+    grafo_bits = GrafoDensoBits(V)
+    grafo_bits.adicionar_arestas(arestas)
+    grafo_bits.imprimir()
+    print("Número de arestas:", grafo_bits.numero_de_arestas())
+    print("Sequência de graus:", grafo_bits.sequencia_de_graus())
+    print("Vizinhos em comum de A e D:", grafo_bits.vizinhos_em_comum("A", "D"))
+    print("É completo?", grafo_bits.is_completo())
+
+
     print("\n===== TESTE GRAFO ESPARSO =====")
     grafo_esparso = GrafoEsparso(V)
     for (u, v) in arestas:
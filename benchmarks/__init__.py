@@ -0,0 +1,2 @@
+# Benchmarks das representações de grafos (Interface, interface2, interface3)
+# e do teste de isomorfismo (iso). Execute com: python -m benchmarks --saida resultados.json
@@ -0,0 +1,68 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.cenarios import CENARIOS, ESCALAS
+
+
+def _chave(r):
+    return (r["cenario"], r.get("modulo", ""), r.get("classe", ""), r["entrada"], r["operacao"])
+
+
+def comparar(anteriores, atuais, limite=1.2):
+    # imprime as medições que ficaram mais lentas que `limite` vezes a anterior
+    antes = {_chave(r): r["segundos"] for r in anteriores}
+    regressoes = 0
+    for r in atuais:
+        t0 = antes.get(_chave(r))
+        if t0 and r["segundos"] > limite * t0:
+            regressoes += 1
+            print(f"REGRESSÃO {'/'.join(filter(None, _chave(r)))}: "
+                  f"{t0:.6f}s -> {r['segundos']:.6f}s ({r['segundos'] / t0:.2f}x)")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks das representações de grafos e do isomorfismo")
+    parser.add_argument("--saida", default="-", help="arquivo JSON de saída ('-' = stdout)")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="pequena")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--cenarios", nargs="+", choices=sorted(CENARIOS), default=sorted(CENARIOS))
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para apontar regressões")
+    args = parser.parse_args(argv)
+
+    resultados = []
+    for nome in args.cenarios:
+        resultados += CENARIOS[nome](args.escala, args.seed, args.repeticoes)
+
+    relatorio = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "escala": args.escala,
+            "seed": args.seed,
+            "repeticoes": args.repeticoes,
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+    }
+    texto = json.dumps(relatorio, indent=1, ensure_ascii=False)
+    if args.saida == "-":
+        print(texto)
+    else:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anteriores = json.load(f)["resultados"]
+        return 1 if comparar(anteriores, resultados) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import time
+import tracemalloc
+
+import Interface
+import interface2
+import interface3
+import iso
+
+from benchmarks import geradores
+
+# Tamanhos por escala: n das representações e n aproximado das instâncias de isomorfismo
+ESCALAS = {
+    "pequena": {"n": 200, "n_iso": 40, "paley": 29, "cfi_base": 6},
+    "media": {"n": 1000, "n_iso": 120, "paley": 61, "cfi_base": 10},
+    "grande": {"n": 3000, "n_iso": 300, "paley": 101, "cfi_base": 16},
+}
+
+# Consultas de cada módulo (os nomes mudam entre as atividades)
+CONSULTAS = {
+    Interface: ["numero_de_arestas", "sequencia_de_graus"],
+    interface2: ["numero_arestas", "sequencia_graus", "is_simples", "is_nulo", "is_completo"],
+    interface3: ["numero_arestas", "sequencia_graus", "is_simples", "is_nulo", "is_completo",
+                 "get_arestas"],
+}
+
+
+def implementacoes():
+    classes = [
+        (Interface, Interface.GrafoDenso), (Interface, Interface.GrafoDensoBits),
+        (Interface, Interface.GrafoEsparso),
+        (interface2, interface2.GrafoDenso), (interface2, interface2.GrafoEsparso),
+        (interface3, interface3.GrafoDenso), (interface3, interface3.GrafoEsparso),
+        (interface3, interface3.GrafoEsparsoContado), (interface3, interface3.GrafoEsparsoCompacto),
+        (interface3, interface3.GrafoAdaptativo),
+    ]
+    if interface3.np is not None:
+        classes.append((interface3, interface3.GrafoDensoNumPy))
+    return classes
+
+
+def medir(funcao, repeticoes=3):
+    # melhor tempo (segundos) entre as repetições
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def pico_memoria(funcao):
+    tracemalloc.start()
+    try:
+        objeto = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objeto
+    return pico
+
+
+def _construir(classe, V, E):
+    g = classe(V)
+    for u, v in E:
+        g.adicionar_aresta(u, v)
+    return g
+
+
+def entradas_representacoes(escala, seed):
+    n = ESCALAS[escala]["n"]
+    return [
+        ("er_esparso", geradores.erdos_renyi(n, 4.0 / n, seed)),
+        ("er_denso", geradores.erdos_renyi(n, 0.5, seed)),
+        ("multigrafo", geradores.multigrafo(n, 4 * n, 0.1, seed)),
+    ]
+
+
+def cenario_representacoes(escala="pequena", seed=0, repeticoes=3):
+    """
+    Custo de mutação (inserir todas as arestas, remover metade) e de cada
+    consulta, mais o pico de memória da construção, para cada classe de
+    Interface, interface2 e interface3.
+    """
+    resultados = []
+    for nome, (V, E) in entradas_representacoes(escala, seed):
+        base = {"cenario": "representacoes", "entrada": nome, "n": len(V), "m": len(E)}
+        for modulo, classe in implementacoes():
+            ident = dict(base, modulo=modulo.__name__, classe=classe.__name__)
+            t, g = medir(lambda: _construir(classe, V, E), repeticoes)
+            resultados.append(dict(ident, operacao="adicionar_aresta", segundos=t,
+                                   pico_memoria_bytes=pico_memoria(lambda: _construir(classe, V, E))))
+            metade = E[::2]
+
+            def remover():
+                h = _construir(classe, V, E)
+                inicio = time.perf_counter()
+                for u, v in metade:
+                    h.remover_aresta(u, v)
+                return time.perf_counter() - inicio
+            resultados.append(dict(ident, operacao="remover_aresta",
+                                   segundos=min(remover() for _ in range(repeticoes))))
+            for consulta in CONSULTAS[modulo]:
+                metodo = getattr(g, consulta)
+                t, _ = medir(metodo, repeticoes)
+                resultados.append(dict(ident, operacao=consulta, segundos=t))
+    return resultados
+
+
+def pares_isomorfismo(escala, seed):
+    # (nome, (V1, E1), (V2, E2), isomorfos?)
+    p = ESCALAS[escala]
+    n = p["n_iso"]
+    er = geradores.erdos_renyi(n, 0.1, seed)
+    reg = geradores.regular_aleatorio(n, 3, seed)
+    pal = geradores.paley(p["paley"])
+    mg = geradores.multigrafo(n, 3 * n, 0.1, seed)
+    grd = geradores.grade(n // 10 or 1, 10)
+    base = geradores.regular_aleatorio(p["cfi_base"], 3, seed)
+    cfi1, cfi2 = geradores.cfi_par(*base)
+    return [
+        ("er_iso", er, geradores.embaralhar(*er, seed=seed), True),
+        ("er_nao_iso", er, geradores.perturbar(*er, seed=seed), False),
+        ("regular3_iso", reg, geradores.embaralhar(*reg, seed=seed), True),
+        ("regular3_nao_iso", reg, geradores.regular_aleatorio(n, 3, seed + 1), None),
+        ("multigrafo_iso", mg, geradores.embaralhar(*mg, seed=seed), True),
+        ("grade_iso", grd, geradores.embaralhar(*grd, seed=seed), True),
+        ("paley_iso", pal, geradores.embaralhar(*pal, seed=seed), True),
+        ("torre_shrikhande", geradores.torre(4), geradores.shrikhande(), False),
+        ("cfi_iso", cfi1, geradores.embaralhar(*cfi1, seed=seed), True),
+        ("cfi_nao_iso", cfi1, cfi2, False),
+    ]
+
+
+def cenario_isomorfismo(escala="pequena", seed=0, repeticoes=3):
+    # are_isomorphic em pares isomorfos e não isomorfos (com os contadores da busca) e canonical_hash
+    resultados = []
+    for nome, (V1, E1), (V2, E2), esperado in pares_isomorfismo(escala, seed):
+        g1, g2 = iso.Graph(V1, E1), iso.Graph(V2, E2)
+        base = {"cenario": "isomorfismo", "entrada": nome, "n": g1.n, "m": g1.num_edges()}
+        t, (resposta, _) = medir(lambda: iso.are_isomorphic(g1, g2), repeticoes)
+        stats = iso.SearchStats()   # execução extra, fora da medição, só para os contadores
+        iso.are_isomorphic(g1, g2, stats=stats)
+        resultados.append(dict(base, operacao="are_isomorphic", segundos=t, isomorfos=resposta,
+                               correto=None if esperado is None else resposta == esperado,
+                               busca=stats.as_dict()))
+        t, _ = medir(g1.canonical_hash, repeticoes)
+        resultados.append(dict(base, operacao="canonical_hash", segundos=t))
+    return resultados
+
+
+CENARIOS = {
+    "representacoes": cenario_representacoes,
+    "isomorfismo": cenario_isomorfismo,
+}
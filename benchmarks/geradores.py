@@ -0,0 +1,177 @@
+import random
+from itertools import combinations
+
+# Todos os geradores devolvem (vértices, arestas), listas que servem para
+# qualquer classe do projeto. A semente torna cada instância reprodutível.
+
+
+def erdos_renyi(n, p, seed=0):
+    rng = random.Random(seed)
+    V = list(range(n))
+    return V, [(u, v) for u, v in combinations(V, 2) if rng.random() < p]
+
+
+def regular_aleatorio(n, d, seed=0, tentativas=1000):
+    """
+    Grafo d-regular simples pelo modelo de configuração. Laços e arestas
+    repetidas do emparelhamento são desfeitos por trocas de pontas com
+    arestas sorteadas (u-v, x-y -> u-x, v-y, que mantêm os graus), em vez
+    de sortear o emparelhamento inteiro de novo; só um reparo que empaca
+    (raro) recomeça com outro emparelhamento, até tentativas vezes. Com
+    d acima de n / 2 gera o complemento, que tem grau n - 1 - d.
+    """
+    if n * d % 2:
+        raise ValueError("n * d precisa ser par")
+    if d < 0 or d > max(n - 1, 0):
+        raise ValueError(f"não existe grafo {d}-regular simples com {n} vértices")
+    V = list(range(n))
+    if 2 * d > n:
+        _, F = regular_aleatorio(n, n - 1 - d, seed, tentativas)
+        fora = {(min(u, v), max(u, v)) for u, v in F}
+        return V, [par for par in combinations(V, 2) if par not in fora]
+    rng = random.Random(seed)
+    pontas = [v for v in V for _ in range(d)]
+    for _ in range(tentativas):
+        rng.shuffle(pontas)
+        E = list(zip(pontas[0::2], pontas[1::2]))
+        if _reparar(E, rng):
+            return V, E
+    raise RuntimeError(f"não gerou um grafo {d}-regular com {n} vértices")
+
+
+def _reparar(E, rng):
+    # Troca as pontas de cada aresta ruim (laço ou cópia repetida) com as de
+    # uma aresta sorteada até o emparelhamento ficar simples; aceita só
+    # trocas que criam dois pares novos. False se empacar.
+    contagem = {}
+    ruins = set()
+    for k, (u, v) in enumerate(E):
+        par = (min(u, v), max(u, v))
+        contagem[par] = contagem.get(par, 0) + 1
+        if u == v or contagem[par] > 1:
+            ruins.add(k)
+
+    recusas = 0
+    while ruins:
+        k = next(iter(ruins))
+        u, v = E[k]
+        if u != v and contagem[(min(u, v), max(u, v))] == 1:   # a outra cópia já saiu
+            ruins.discard(k)
+            continue
+        t = rng.randrange(len(E))
+        x, y = E[t]
+        if rng.random() < 0.5:
+            x, y = y, x
+        velhos = (min(u, v), max(u, v)), (min(x, y), max(x, y))
+        a, b = (min(u, x), max(u, x)), (min(v, y), max(v, y))
+        for par in velhos:
+            contagem[par] -= 1
+        if t != k and u != x and v != y and a != b and not contagem.get(a) and not contagem.get(b):
+            for par in (a, b):
+                contagem[par] = contagem.get(par, 0) + 1
+            E[k], E[t] = (u, x), (v, y)
+            ruins.discard(k)
+            ruins.discard(t)
+            recusas = 0
+        else:
+            for par in velhos:
+                contagem[par] += 1
+            recusas += 1
+            if recusas > 100 + len(E):
+                return False
+    return True
+
+
+def multigrafo(n, m, prob_laco=0.1, seed=0):
+    rng = random.Random(seed)
+    E = []
+    for _ in range(m):
+        u = rng.randrange(n)
+        v = u if rng.random() < prob_laco else rng.randrange(n)
+        E.append((u, v))
+    return list(range(n)), E
+
+
+def grade(linhas, colunas):
+    V = [(i, j) for i in range(linhas) for j in range(colunas)]
+    E = [((i, j), (i, j + 1)) for i in range(linhas) for j in range(colunas - 1)]
+    E += [((i, j), (i + 1, j)) for i in range(linhas - 1) for j in range(colunas)]
+    return V, E
+
+
+def paley(q):
+    # fortemente regular (q, (q-1)/2, (q-5)/4, (q-1)/4); q primo com q % 4 == 1
+    if q % 4 != 1 or any(q % k == 0 for k in range(2, int(q ** 0.5) + 1)):
+        raise ValueError("q deve ser primo e congruente a 1 mod 4")
+    quadrados = {x * x % q for x in range(1, q)}
+    V = list(range(q))
+    return V, [(u, v) for u, v in combinations(V, 2) if (v - u) % q in quadrados]
+
+
+def torre(k):
+    # grafo das torres k x k (fortemente regular); para k = 4 é coespectral com Shrikhande
+    V = list(range(k * k))
+    return V, [(u, v) for u, v in combinations(V, 2) if u // k == v // k or u % k == v % k]
+
+
+def shrikhande():
+    # fortemente regular (16, 6, 2, 2), não isomorfo a torre(4)
+    saltos = {(0, 1), (0, 3), (1, 0), (3, 0), (1, 1), (3, 3)}
+    V = list(range(16))
+    E = [(u, v) for u, v in combinations(V, 2)
+         if ((u // 4 - v // 4) % 4, (u % 4 - v % 4) % 4) in saltos]
+    return V, E
+
+
+def cfi_par(base_vertices, base_arestas):
+    """
+    Par de Cai-Fürer-Immerman sobre um grafo base conexo: as duas versões
+    só diferem por uma aresta "torcida", são indistinguíveis pelo
+    refinamento de cores e não são isomorfas.
+    """
+    incidentes = {v: [] for v in base_vertices}
+    for k, (u, v) in enumerate(base_arestas):
+        incidentes[u].append(k)
+        incidentes[v].append(k)
+
+    def construir(torcida):
+        V, E = [], []
+        for v in base_vertices:
+            es = incidentes[v]
+            for k in es:
+                V += [("a", v, k, 0), ("a", v, k, 1)]
+            for r in range(0, len(es) + 1, 2):
+                for S in combinations(es, r):
+                    meio = ("m", v, S)
+                    V.append(meio)
+                    E += [(meio, ("a", v, k, 1 if k in S else 0)) for k in es]
+        for k, (u, v) in enumerate(base_arestas):
+            for b in (0, 1):
+                E.append((("a", u, k, b), ("a", v, k, 1 - b if k == torcida else b)))
+        return V, E
+
+    return construir(None), construir(0)
+
+
+def embaralhar(vertices, arestas, seed=0):
+    # cópia isomorfa com rótulos novos (inteiros) e arestas em outra ordem
+    rng = random.Random(seed)
+    novos = list(range(len(vertices)))
+    rng.shuffle(novos)
+    mapa = dict(zip(vertices, novos))
+    E = [(mapa[u], mapa[v]) for u, v in arestas]
+    rng.shuffle(E)
+    return sorted(novos), E
+
+
+def perturbar(vertices, arestas, seed=0):
+    # move uma aresta de lugar: em geral dá um grafo não isomorfo com os mesmos n e m
+    rng = random.Random(seed)
+    E = list(arestas)
+    existentes = {frozenset(e) for e in E}
+    E.pop(rng.randrange(len(E)))
+    while True:
+        u, v = rng.sample(list(vertices), 2)
+        if frozenset((u, v)) not in existentes:
+            E.append((u, v))
+            return list(vertices), E
@@ -33,6 +33,96 @@ class Grafo(ABC):
     def is_completo(self): pass
 
 
+# ==========================
+# INVARIANTES MANTIDOS
+# ==========================
+class Invariantes:
+    # Contadores atualizados a cada inserção/remoção, para que as consultas
+    # (número de arestas, graus, simples, nulo, completo) custem O(1).
+    # m é a multiplicidade do par (i, j) antes da alteração.
+    def __init__(self, n):
+        self.arestas = 0
+        self.lacos = 0
+        self.pares_distintos = 0    # pares {i, j}, i != j, com ao menos uma aresta
+        self.pares_multiplos = 0    # pares {i, j}, i != j, com duas ou mais arestas
+        self.graus = [0] * n        # laço conta 2 no grau
+
+    def adicionar(self, i, j, m):
+        self.arestas += 1
+        if i == j:
+            self.lacos += 1
+            self.graus[i] += 2
+            return
+        self.graus[i] += 1
+        self.graus[j] += 1
+        if m == 0:
+            self.pares_distintos += 1
+        elif m == 1:
+            self.pares_multiplos += 1
+
+    def remover(self, i, j, m):
+        self.arestas -= 1
+        if i == j:
+            self.lacos -= 1
+            self.graus[i] -= 2
+            return
+        self.graus[i] -= 1
+        self.graus[j] -= 1
+        if m == 1:
+            self.pares_distintos -= 1
+        elif m == 2:
+            self.pares_multiplos -= 1
+
+    def aplicar_lote(self, mudancas):
+        # mudancas: (i, j, multiplicidade antes, multiplicidade depois) de cada
+        # par alterado; os contadores recebem a soma das diferenças de uma vez
+        arestas = lacos = distintos = multiplos = 0
+        graus = {}
+        for i, j, antes, depois in mudancas:
+            d = depois - antes
+            arestas += d
+            if i == j:
+                lacos += d
+                graus[i] = graus.get(i, 0) + 2 * d
+                continue
+            graus[i] = graus.get(i, 0) + d
+            graus[j] = graus.get(j, 0) + d
+            distintos += (depois > 0) - (antes > 0)
+            multiplos += (depois > 1) - (antes > 1)
+        self.arestas += arestas
+        self.lacos += lacos
+        self.pares_distintos += distintos
+        self.pares_multiplos += multiplos
+        for i, d in graus.items():
+            self.graus[i] += d
+
+
+# ==========================
+# LOTES TRANSACIONAIS
+# ==========================
+# aplicar_lote(adicoes, remocoes) valida todos os rótulos antes de alterar
+# o grafo (KeyError se algum não existir), aplica as remoções antes das
+# inserções com o efeito líquido de cada par calculado de uma vez e
+# atualiza os contadores no fim. Se a escrita falhar no meio, o que já foi
+# escrito é desfeito. Retorna (arestas inseridas, arestas removidas);
+# remover uma aresta ausente não conta, como em remover_aresta.
+def _agrupar_lote(indice, adicoes, remocoes):
+    # {(i, j), i <= j: [inserções, remoções]}
+    pares = {}
+    for arestas, k in ((adicoes, 0), (remocoes, 1)):
+        for u, v in arestas:
+            if u not in indice or v not in indice:
+                raise KeyError(u if u not in indice else v)
+            i, j = indice[u], indice[v]
+            if i > j:
+                i, j = j, i
+            c = pares.get((i, j))
+            if c is None:
+                c = pares[(i, j)] = [0, 0]
+            c[k] += 1
+    return pares
+
+
 # ==========================
 # GRAFO DENSO (MATRIZ)
 # ==========================
@@ -40,19 +130,67 @@ class GrafoDenso(Grafo):
     def __init__(self, vertices):
         self.vertices = vertices
         self.n = len(vertices)
+        self.indice = {v: i for i, v in enumerate(vertices)}  # rótulo -> linha da matriz
         self.matriz = [[0] * self.n for _ in range(self.n)]
+        self.inv = Invariantes(self.n)
 
     def adicionar_aresta(self, u, v):
-        i, j = self.vertices.index(u), self.vertices.index(v)
+        i, j = self.indice[u], self.indice[v]
+        self.inv.adicionar(i, j, self.matriz[i][j])
         self.matriz[i][j] += 1
         self.matriz[j][i] += 1
 
+    # Inserção em lote: uma passada sobre qualquer iterável de pares (u, v)
+    def adicionar_arestas(self, arestas):
+        indice, matriz, adicionar = self.indice, self.matriz, self.inv.adicionar
+        for u, v in arestas:
+            i, j = indice[u], indice[v]
+            adicionar(i, j, matriz[i][j])
+            matriz[i][j] += 1
+            matriz[j][i] += 1
+
     def remover_aresta(self, u, v):
-        i, j = self.vertices.index(u), self.vertices.index(v)
+        i, j = self.indice[u], self.indice[v]
         if self.matriz[i][j] > 0:
+            self.inv.remover(i, j, self.matriz[i][j])
             self.matriz[i][j] -= 1
             self.matriz[j][i] -= 1
 
+    # Lote transacional; as células são escritas em ordem de linha
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        matriz = self.matriz
+        mudancas = []
+        escritas = []   # (linha, coluna, valor): cada par toca (i, j) e (j, i)
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = matriz[i][j] if i != j else matriz[i][i] // 2
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if a == k:
+                continue
+            depois = m - k + a
+            mudancas.append((i, j, m, depois))
+            if i == j:
+                escritas.append((i, i, 2 * depois))   # laço ocupa 2
+            else:
+                escritas.append((i, j, depois))
+                escritas.append((j, i, depois))
+        escritas.sort()
+        antigas = []
+        try:
+            for i, j, valor in escritas:
+                linha = matriz[i]
+                antiga = linha[j]
+                linha[j] = valor
+                antigas.append((linha, j, antiga))
+        except BaseException:
+            for linha, j, valor in reversed(antigas):
+                linha[j] = valor
+            raise
+        self.inv.aplicar_lote(mudancas)
+        return inseridas, removidas
+
     def mostrar(self):
         print("Matriz de Adjacência:")
         print("   ", " ".join(self.vertices))
@@ -63,22 +201,15 @@ class GrafoDenso(Grafo):
         return self.n
 
     def numero_arestas(self):
-        return sum(sum(linha) for linha in self.matriz) // 2
+        return self.inv.arestas
 
     def sequencia_graus(self):
-        return [sum(linha) for linha in self.matriz]
+        return list(self.inv.graus)
 
     # Métodos da Atividade 1
     def is_simples(self):
         # Não pode ter laço ou múltiplas arestas
-        for i in range(self.n):
-            if self.matriz[i][i] > 0:
-                return False
-        for i in range(self.n):
-            for j in range(i+1, self.n):
-                if self.matriz[i][j] > 1:
-                    return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_multiplos == 0
 
     def is_nulo(self):
         return self.numero_arestas() == 0
@@ -93,17 +224,82 @@ class GrafoDenso(Grafo):
 class GrafoEsparso(Grafo):
     def __init__(self, vertices):
         self.vertices = vertices
+        self.indice = {v: i for i, v in enumerate(vertices)}
         self.lista_adj = {v: [] for v in vertices}
+        self.inv = Invariantes(len(vertices))
+
+    def _contar(self, u, v):
+        # Multiplicidade do par lida das próprias listas, na menor das duas:
+        # O(min(grau)), sem um índice de pares ao lado das listas.
+        # Cada laço aparece duas vezes na lista do vértice.
+        lu, lv = self.lista_adj[u], self.lista_adj[v]
+        if u == v:
+            return lu.count(v) // 2
+        return lu.count(v) if len(lu) <= len(lv) else lv.count(u)
 
     def adicionar_aresta(self, u, v):
+        m = self._contar(u, v)
+        self.inv.adicionar(self.indice[u], self.indice[v], m)
         self.lista_adj[u].append(v)
         self.lista_adj[v].append(u)
 
     def remover_aresta(self, u, v):
-        if v in self.lista_adj[u]:
-            self.lista_adj[u].remove(v)
-        if u in self.lista_adj[v]:
-            self.lista_adj[v].remove(u)
+        m = self._contar(u, v)
+        if m == 0:
+            return
+        self.inv.remover(self.indice[u], self.indice[v], m)
+        self.lista_adj[u].remove(v)
+        self.lista_adj[v].remove(u)
+
+    # Lote transacional: cada lista afetada é refeita uma vez
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        vertices, lista = self.vertices, self.lista_adj
+        mudancas = []
+        tirar = {}   # vértice -> {vizinho: ocorrências a retirar da lista}
+        por = {}     # vértice -> vizinhos a acrescentar na lista
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            u, v = vertices[i], vertices[j]
+            m = self._contar(u, v)
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if k:   # laço: u e v coincidem e saem duas entradas, como em remover_aresta
+                t = tirar.setdefault(u, {})
+                t[v] = t.get(v, 0) + k
+                t = tirar.setdefault(v, {})
+                t[u] = t.get(u, 0) + k
+            if a:
+                por.setdefault(u, []).extend([v] * a)
+                por.setdefault(v, []).extend([u] * a)
+            if a != k:
+                mudancas.append((i, j, m, m - k + a))
+        novas = {}
+        for u, t in tirar.items():
+            nova = []
+            for w in lista[u]:
+                if t.get(w):
+                    t[w] -= 1
+                else:
+                    nova.append(w)
+            novas[u] = nova
+
+        trocadas, tamanhos = {}, {}
+        try:
+            for u, nova in novas.items():
+                trocadas[u] = lista[u]
+                lista[u] = nova
+            for u, ws in por.items():
+                tamanhos[u] = len(lista[u])
+                lista[u].extend(ws)
+        except BaseException:
+            for u, n in tamanhos.items():
+                del lista[u][n:]
+            for u, velha in trocadas.items():
+                lista[u] = velha
+            raise
+        self.inv.aplicar_lote(mudancas)
+        return inseridas, removidas
 
     def mostrar(self):
         print("Lista de Adjacência:")
@@ -114,31 +310,23 @@ class GrafoEsparso(Grafo):
         return len(self.vertices)
 
     def numero_arestas(self):
-        return sum(len(adj) for adj in self.lista_adj.values()) // 2
+        return self.inv.arestas
 
     def sequencia_graus(self):
-        return [len(self.lista_adj[v]) for v in self.vertices]
+        return list(self.inv.graus)
 
     # Métodos da Atividade 1
     def is_simples(self):
         # Não pode ter laço ou múltiplas arestas
-        for v in self.lista_adj:
-            if v in self.lista_adj[v]:
-                return False
-            vizinhos = self.lista_adj[v]
-            if len(vizinhos) != len(set(vizinhos)):
-                return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_multiplos == 0
 
     def is_nulo(self):
         return self.numero_arestas() == 0
 
     def is_completo(self):
+        # sem laços e com todos os pares de vértices distintos adjacentes
         n = len(self.vertices)
-        for v in self.lista_adj:
-            if len(set(self.lista_adj[v])) != n - 1:
-                return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_distintos == n * (n - 1) // 2
 
 
 # ==========================
@@ -1,9 +1,20 @@
+import weakref
 from abc import ABC, abstractmethod 
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: só GrafoDensoNumPy depende dele
+    np = None
 
 # ==========================
 # INTERFACE
 # ==========================
 class Grafo(ABC):
+    __slots__ = ()   # quem não declara __slots__ continua com __dict__
+
     @abstractmethod
     def adicionar_aresta(self, u, v): pass
     
@@ -49,6 +60,149 @@ class Grafo(ABC):
     def is_subgrafo_induzido(self, outro_grafo): pass
 
 
+# ==========================
+# INVARIANTES MANTIDOS
+# ==========================
+class Invariantes:
+    # Contadores atualizados a cada inserção/remoção, para que as consultas
+    # (número de arestas, graus, simples, nulo, completo) custem O(1).
+    # m é a multiplicidade do par (i, j) antes da alteração.
+    __slots__ = ("arestas", "lacos", "pares_distintos", "pares_multiplos", "graus")
+
+    def __init__(self, n):
+        self.arestas = 0
+        self.lacos = 0
+        self.pares_distintos = 0    # pares {i, j}, i != j, com ao menos uma aresta
+        self.pares_multiplos = 0    # pares {i, j}, i != j, com duas ou mais arestas
+        self.graus = [0] * n        # laço conta 2 no grau
+
+    def adicionar(self, i, j, m):
+        self.arestas += 1
+        if i == j:
+            self.lacos += 1
+            self.graus[i] += 2
+            return
+        self.graus[i] += 1
+        self.graus[j] += 1
+        if m == 0:
+            self.pares_distintos += 1
+        elif m == 1:
+            self.pares_multiplos += 1
+
+    def remover(self, i, j, m):
+        self.arestas -= 1
+        if i == j:
+            self.lacos -= 1
+            self.graus[i] -= 2
+            return
+        self.graus[i] -= 1
+        self.graus[j] -= 1
+        if m == 1:
+            self.pares_distintos -= 1
+        elif m == 2:
+            self.pares_multiplos -= 1
+
+    def aplicar_lote(self, mudancas):
+        # mudancas: (i, j, multiplicidade antes, multiplicidade depois) de cada
+        # par alterado; os contadores recebem a soma das diferenças de uma vez
+        arestas = lacos = distintos = multiplos = 0
+        graus = {}
+        for i, j, antes, depois in mudancas:
+            d = depois - antes
+            arestas += d
+            if i == j:
+                lacos += d
+                graus[i] = graus.get(i, 0) + 2 * d
+                continue
+            graus[i] = graus.get(i, 0) + d
+            graus[j] = graus.get(j, 0) + d
+            distintos += (depois > 0) - (antes > 0)
+            multiplos += (depois > 1) - (antes > 1)
+        self.arestas += arestas
+        self.lacos += lacos
+        self.pares_distintos += distintos
+        self.pares_multiplos += multiplos
+        for i, d in graus.items():
+            self.graus[i] += d
+
+
+# ==========================
+# LOTES TRANSACIONAIS
+# ==========================
+# aplicar_lote(adicoes, remocoes) valida todos os rótulos antes de alterar
+# o grafo (KeyError se algum não existir), aplica as remoções antes das
+# inserções com o efeito líquido de cada par calculado de uma vez e
+# atualiza os contadores no fim. Se a escrita falhar no meio, o que já foi
+# escrito é desfeito. Retorna (arestas inseridas, arestas removidas);
+# remover uma aresta ausente não conta, como em remover_aresta.
+def _agrupar_lote(indice, adicoes, remocoes):
+    # {(i, j), i <= j: [inserções, remoções]}
+    pares = {}
+    for arestas, k in ((adicoes, 0), (remocoes, 1)):
+        for u, v in arestas:
+            if u not in indice or v not in indice:
+                raise KeyError(u if u not in indice else v)
+            i, j = indice[u], indice[v]
+            if i > j:
+                i, j = j, i
+            c = pares.get((i, j))
+            if c is None:
+                c = pares[(i, j)] = [0, 0]
+            c[k] += 1
+    return pares
+
+
+# ==========================
+# SUBGRAFOS
+# ==========================
+# Comparações em fluxo com saída antecipada. Usam só tem_vertice,
+# tem_aresta (O(1) sobre a matriz ou os contadores, O(menor grau) sobre as
+# listas de GrafoEsparso) e vizinhos, sem montar conjuntos com todas as
+# arestas dos dois grafos.
+def _vertices_contidos(g, h):
+    return all(h.tem_vertice(v) for v in g.get_vertices())
+
+
+def _arestas_contidas(g, h):
+    for u in g.get_vertices():
+        for w in g.vizinhos(u):
+            if not h.tem_aresta(u, w):
+                return False
+    return True
+
+
+def _iter_arestas(g, multiplicidade=False):
+    # cada par adjacente uma vez (laços incluídos), na ordem dos vértices de g
+    indice = g.indice
+    for u in g.get_vertices():
+        i = indice[u]
+        for w in g.vizinhos(u):
+            if indice[w] >= i:
+                yield (u, w, g.multiplicidade(u, w)) if multiplicidade else (u, w)
+
+
+def _is_subgrafo(g, h):
+    return (g.numero_vertices() <= h.numero_vertices() and
+            _vertices_contidos(g, h) and _arestas_contidas(g, h))
+
+
+def _is_subgrafo_gerador(g, h):
+    return (g.numero_vertices() == h.numero_vertices() and
+            _vertices_contidos(g, h) and _arestas_contidas(g, h))
+
+
+def _is_subgrafo_induzido(g, h):
+    # g é induzido se suas arestas são exatamente as de h entre os vértices
+    # de g: percorre só a vizinhança em h de cada vértice de g
+    if not _is_subgrafo(g, h):
+        return False
+    for u in g.get_vertices():
+        for w in h.vizinhos(u):
+            if g.tem_vertice(w) and not g.tem_aresta(u, w):
+                return False
+    return True
+
+
 # ==========================
 # GRAFO DENSO (MATRIZ)
 # ==========================
@@ -56,18 +210,76 @@ class GrafoDenso(Grafo):
     def __init__(self, vertices):
         self.vertices = vertices
         self.n = len(vertices)
+        self.indice = {v: i for i, v in enumerate(vertices)}  # rótulo -> linha da matriz
         self.matriz = [[0] * self.n for _ in range(self.n)]
+        self.inv = Invariantes(self.n)
+        self.versao = 0   # incrementada a cada mutação (ver MemoConsultas)
 
     def adicionar_aresta(self, u, v):
-        i, j = self.vertices.index(u), self.vertices.index(v)
+        i, j = self.indice[u], self.indice[v]
+        self.inv.adicionar(i, j, self.matriz[i][j])
         self.matriz[i][j] += 1
         self.matriz[j][i] += 1
+        self.versao += 1
+
+    # Inserção em lote: uma passada sobre qualquer iterável de pares (u, v)
+    def adicionar_arestas(self, arestas):
+        indice, matriz, adicionar = self.indice, self.matriz, self.inv.adicionar
+        antes = self.inv.arestas
+        try:
+            for u, v in arestas:
+                i, j = indice[u], indice[v]
+                adicionar(i, j, matriz[i][j])
+                matriz[i][j] += 1
+                matriz[j][i] += 1
+        finally:   # também quando um rótulo inválido interrompe o lote no meio
+            if self.inv.arestas != antes:
+                self.versao += 1
 
     def remover_aresta(self, u, v):
-        i, j = self.vertices.index(u), self.vertices.index(v)
+        i, j = self.indice[u], self.indice[v]
         if self.matriz[i][j] > 0:
+            self.inv.remover(i, j, self.matriz[i][j])
             self.matriz[i][j] -= 1
             self.matriz[j][i] -= 1
+            self.versao += 1
+
+    # Lote transacional; as células são escritas em ordem de linha
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        matriz = self.matriz
+        mudancas = []
+        escritas = []   # (linha, coluna, valor): cada par toca (i, j) e (j, i)
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = matriz[i][j] if i != j else matriz[i][i] // 2
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if a == k:
+                continue
+            depois = m - k + a
+            mudancas.append((i, j, m, depois))
+            if i == j:
+                escritas.append((i, i, 2 * depois))   # laço ocupa 2
+            else:
+                escritas.append((i, j, depois))
+                escritas.append((j, i, depois))
+        escritas.sort()
+        antigas = []
+        try:
+            for i, j, valor in escritas:
+                linha = matriz[i]
+                antiga = linha[j]
+                linha[j] = valor
+                antigas.append((linha, j, antiga))
+        except BaseException:
+            for linha, j, valor in reversed(antigas):
+                linha[j] = valor
+            raise
+        self.inv.aplicar_lote(mudancas)
+        if mudancas:
+            self.versao += 1
+        return inseridas, removidas
 
     def mostrar(self):
         print("Matriz de Adjacência:")
@@ -79,21 +291,14 @@ class GrafoDenso(Grafo):
         return self.n
 
     def numero_arestas(self):
-        return sum(sum(linha) for linha in self.matriz) // 2
+        return self.inv.arestas
 
     def sequencia_graus(self):
-        return [sum(linha) for linha in self.matriz]
+        return list(self.inv.graus)
 
     # Métodos da Atividade 1
     def is_simples(self):
-        for i in range(self.n):
-            if self.matriz[i][i] > 0:
-                return False
-        for i in range(self.n):
-            for j in range(i+1, self.n):
-                if self.matriz[i][j] > 1:
-                    return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_multiplos == 0
 
     def is_nulo(self):
         return self.numero_arestas() == 0
@@ -113,24 +318,157 @@ class GrafoDenso(Grafo):
                     arestas.append((self.vertices[i], self.vertices[j]))
         return arestas
 
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        return self.matriz[self.indice[u]][self.indice[v]] > 0
+
+    def multiplicidade(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        return self.matriz[i][j] if i != j else self.matriz[i][i] // 2   # laço ocupa 2
+
+    def vizinhos(self, u):
+        linha = self.matriz[self.indice[u]]
+        return [self.vertices[j] for j in range(self.n) if linha[j] > 0]
+
+    # Pares adjacentes sob demanda (laços incluídos, i <= j), sem montar lista
+    def iter_arestas(self, multiplicidade=False):
+        vertices = self.vertices
+        for i in range(self.n):
+            linha = self.matriz[i]
+            for j in range(i, self.n):
+                if linha[j] > 0:
+                    if multiplicidade:
+                        yield vertices[i], vertices[j], int(linha[j] if i != j else linha[j] // 2)
+                    else:
+                        yield vertices[i], vertices[j]
+
     def is_subgrafo(self, outro_grafo):
-        return (set(self.get_vertices()).issubset(set(outro_grafo.get_vertices())) and
-                set(self.get_arestas()).issubset(set(outro_grafo.get_arestas())))
+        return _is_subgrafo(self, outro_grafo)
 
     def is_subgrafo_gerador(self, outro_grafo):
-        return (set(self.get_vertices()) == set(outro_grafo.get_vertices()) and
-                set(self.get_arestas()).issubset(set(outro_grafo.get_arestas())))
+        return _is_subgrafo_gerador(self, outro_grafo)
 
     def is_subgrafo_induzido(self, outro_grafo):
-        if not set(self.get_vertices()).issubset(set(outro_grafo.get_vertices())):
-            return False
-        arestas_outro = set(outro_grafo.get_arestas())
-        arestas_induzidas = set()
-        for u in self.get_vertices():
-            for v in self.get_vertices():
-                if u != v and (u, v) in arestas_outro or (v, u) in arestas_outro:
-                    arestas_induzidas.add(tuple(sorted((u, v))))
-        return set(self.get_arestas()) == arestas_induzidas
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+    def subgrafo_induzido(self, vertices):
+        return VisaoInduzida(self, vertices)
+
+    def subgrafo_gerador(self, arestas):
+        return VisaoGeradora(self, arestas)
+
+    def complemento(self):
+        return VisaoComplemento(self)
+
+
+# ==========================
+# GRAFO DENSO (MATRIZ NUMPY)
+# ==========================
+class GrafoDensoNumPy(GrafoDenso):
+    # Mesma semântica do GrafoDenso, mas a matriz é um ndarray int32 e as
+    # consultas são reduções vetorizadas em vez de laços em Python.
+    def __init__(self, vertices):
+        if np is None:
+            raise ImportError("GrafoDensoNumPy requer o pacote numpy")
+        self.vertices = vertices
+        self.n = len(vertices)
+        self.indice = {v: i for i, v in enumerate(vertices)}
+        self.matriz = np.zeros((self.n, self.n), dtype=np.int32)
+        self.versao = 0
+
+    def _indices(self, arestas):
+        indice = self.indice
+        pos = np.fromiter((indice[x] for par in arestas for x in par), dtype=np.intp)
+        return pos[0::2], pos[1::2]
+
+    def adicionar_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        self.matriz[i, j] += 1
+        self.matriz[j, i] += 1
+        self.versao += 1
+
+    def adicionar_arestas(self, arestas):
+        self.adicionar_arestas_indices(*self._indices(arestas))
+
+    def adicionar_arestas_indices(self, i, j):
+        # i, j: arrays de índices de linha; pares repetidos somam multiplicidade
+        i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+        np.add.at(self.matriz, (i, j), 1)
+        np.add.at(self.matriz, (j, i), 1)
+        if i.size:
+            self.versao += 1
+
+    def remover_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        if self.matriz[i, j] > 0:
+            self.matriz[i, j] -= 1
+            self.matriz[j, i] -= 1
+            self.versao += 1
+
+    def remover_arestas(self, arestas):
+        self.remover_arestas_indices(*self._indices(arestas))
+
+    def remover_arestas_indices(self, i, j):
+        # Equivale a remover um par de cada vez: a multiplicidade não fica negativa
+        i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+        a, b = np.minimum(i, j), np.maximum(i, j)
+        pares, vezes = np.unique(np.stack([a, b]), axis=1, return_counts=True)
+        a, b = pares
+        laco = a == b
+        vezes = np.where(laco, 2 * vezes, vezes)   # um laço ocupa 2 na diagonal
+        antigo = self.matriz[a, b]
+        novo = np.maximum(antigo - vezes, 0).astype(self.matriz.dtype)
+        self.matriz[a, b] = novo
+        self.matriz[b, a] = novo
+        if (novo != antigo).any():   # remover pares ausentes não muda o grafo
+            self.versao += 1
+
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        # mesmo contrato do GrafoDenso, com uma leitura e uma escrita vetorizadas
+        pares = _agrupar_lote(self.indice, adicoes, remocoes)
+        if not pares:
+            return 0, 0
+        i, j = np.array(list(pares), dtype=np.intp).T
+        a, r = np.array(list(pares.values()), dtype=np.int64).T
+        laco = i == j
+        antigo = self.matriz[i, j].copy()
+        m = np.where(laco, antigo // 2, antigo)
+        k = np.minimum(r, m)
+        depois = m - k + a
+        novo = np.where(laco, 2 * depois, depois).astype(self.matriz.dtype)
+        try:
+            self.matriz[i, j] = novo
+            self.matriz[j, i] = novo
+        except BaseException:
+            self.matriz[i, j] = antigo
+            self.matriz[j, i] = antigo
+            raise
+        if (novo != antigo).any():   # efeito líquido nulo não conta como mutação
+            self.versao += 1
+        return int(a.sum()), int(k.sum())
+
+    def numero_arestas(self):
+        return int(self.matriz.sum()) // 2
+
+    def sequencia_graus(self):
+        return self.matriz.sum(axis=1).tolist()
+
+    def is_simples(self):
+        return not self.matriz.diagonal().any() and not (self.matriz > 1).any()
+
+    def is_nulo(self):
+        return not self.matriz.any()
+
+    def vizinhos(self, u):
+        colunas = np.flatnonzero(self.matriz[self.indice[u]])
+        return [self.vertices[j] for j in colunas.tolist()]
+
+    def get_arestas(self):
+        linhas, colunas = np.nonzero(np.triu(self.matriz, 1))
+        vertices = self.vertices
+        return [(vertices[i], vertices[j]) for i, j in zip(linhas.tolist(), colunas.tolist())]
 
 
 # ==========================
@@ -139,17 +477,88 @@ class GrafoDenso(Grafo):
 class GrafoEsparso(Grafo):
     def __init__(self, vertices):
         self.vertices = vertices
+        self.indice = {v: i for i, v in enumerate(vertices)}
         self.lista_adj = {v: [] for v in vertices}
+        self.inv = Invariantes(len(vertices))
+        self.versao = 0
+
+    def _contar(self, u, v):
+        # Multiplicidade do par lida das próprias listas, na menor das duas:
+        # O(min(grau)) sem um índice de pares ao lado, que custaria cerca de
+        # 4x a memória das listas (para O(1) há o GrafoEsparsoContado).
+        # Cada laço aparece duas vezes na lista do vértice.
+        lu, lv = self.lista_adj[u], self.lista_adj[v]
+        if u == v:
+            return lu.count(v) // 2
+        return lu.count(v) if len(lu) <= len(lv) else lv.count(u)
 
     def adicionar_aresta(self, u, v):
+        m = self._contar(u, v)
+        self.inv.adicionar(self.indice[u], self.indice[v], m)
         self.lista_adj[u].append(v)
         self.lista_adj[v].append(u)
+        self.versao += 1
 
     def remover_aresta(self, u, v):
-        if v in self.lista_adj[u]:
-            self.lista_adj[u].remove(v)
-        if u in self.lista_adj[v]:
-            self.lista_adj[v].remove(u)
+        m = self._contar(u, v)
+        if m == 0:
+            return
+        self.inv.remover(self.indice[u], self.indice[v], m)
+        self.lista_adj[u].remove(v)
+        self.lista_adj[v].remove(u)
+        self.versao += 1
+
+    # Lote transacional: cada lista afetada é refeita uma vez
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        vertices, lista = self.vertices, self.lista_adj
+        mudancas = []
+        tirar = {}   # vértice -> {vizinho: ocorrências a retirar da lista}
+        por = {}     # vértice -> vizinhos a acrescentar na lista
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            u, v = vertices[i], vertices[j]
+            m = self._contar(u, v)
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if k:   # laço: u e v coincidem e saem duas entradas, como em remover_aresta
+                t = tirar.setdefault(u, {})
+                t[v] = t.get(v, 0) + k
+                t = tirar.setdefault(v, {})
+                t[u] = t.get(u, 0) + k
+            if a:
+                por.setdefault(u, []).extend([v] * a)
+                por.setdefault(v, []).extend([u] * a)
+            if a != k:
+                mudancas.append((i, j, m, m - k + a))
+        novas = {}
+        for u, t in tirar.items():
+            nova = []
+            for w in lista[u]:
+                if t.get(w):
+                    t[w] -= 1
+                else:
+                    nova.append(w)
+            novas[u] = nova
+
+        trocadas, tamanhos = {}, {}
+        try:
+            for u, nova in novas.items():
+                trocadas[u] = lista[u]
+                lista[u] = nova
+            for u, ws in por.items():
+                tamanhos[u] = len(lista[u])
+                lista[u].extend(ws)
+        except BaseException:
+            for u, n in tamanhos.items():
+                del lista[u][n:]
+            for u, velha in trocadas.items():
+                lista[u] = velha
+            raise
+        self.inv.aplicar_lote(mudancas)
+        if mudancas:
+            self.versao += 1
+        return inseridas, removidas
 
     def mostrar(self):
         print("Lista de Adjacência:")
@@ -160,30 +569,22 @@ class GrafoEsparso(Grafo):
         return len(self.vertices)
 
     def numero_arestas(self):
-        return sum(len(adj) for adj in self.lista_adj.values()) // 2
+        return self.inv.arestas
 
     def sequencia_graus(self):
-        return [len(self.lista_adj[v]) for v in self.vertices]
+        return list(self.inv.graus)
 
     # Métodos da Atividade 1
     def is_simples(self):
-        for v in self.lista_adj:
-            if v in self.lista_adj[v]:
-                return False
-            vizinhos = self.lista_adj[v]
-            if len(vizinhos) != len(set(vizinhos)):
-                return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_multiplos == 0
 
     def is_nulo(self):
         return self.numero_arestas() == 0
 
     def is_completo(self):
+        # sem laços e com todos os pares de vértices distintos adjacentes
         n = len(self.vertices)
-        for v in self.lista_adj:
-            if len(set(self.lista_adj[v])) != n - 1:
-                return False
-        return True
+        return self.inv.lacos == 0 and self.inv.pares_distintos == n * (n - 1) // 2
 
     # Métodos da Atividade 3
     def get_vertices(self):
@@ -196,24 +597,850 @@ class GrafoEsparso(Grafo):
                 arestas.add(tuple(sorted((u, v))))
         return list(arestas)
 
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        lu, lv = self.lista_adj[u], self.lista_adj[v]
+        return v in lu if len(lu) <= len(lv) else u in lv
+
+    def multiplicidade(self, u, v):
+        return self._contar(u, v)
+
+    def vizinhos(self, u):
+        return dict.fromkeys(self.lista_adj[u]).keys()
+
+    # Pares adjacentes sob demanda (laços incluídos), sem o conjunto de
+    # get_arestas; as multiplicidades saem de uma contagem por vértice
+    def iter_arestas(self, multiplicidade=False):
+        indice = self.indice
+        for u in self.vertices:
+            i = indice[u]
+            contagem = {}
+            for w in self.lista_adj[u]:
+                if indice[w] >= i:
+                    contagem[w] = contagem.get(w, 0) + 1
+            for w, m in contagem.items():
+                if multiplicidade:
+                    yield u, w, m // 2 if w == u else m
+                else:
+                    yield u, w
+
+    def is_subgrafo(self, outro_grafo):
+        return _is_subgrafo(self, outro_grafo)
+
+    def is_subgrafo_gerador(self, outro_grafo):
+        return _is_subgrafo_gerador(self, outro_grafo)
+
+    def is_subgrafo_induzido(self, outro_grafo):
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+    def subgrafo_induzido(self, vertices):
+        return VisaoInduzida(self, vertices)
+
+    def subgrafo_gerador(self, arestas):
+        return VisaoGeradora(self, arestas)
+
+    def complemento(self):
+        return VisaoComplemento(self)
+
+    # Retrato imutável em CSR para cargas só de leitura
+    def freeze(self):
+        return GrafoCSR(self.vertices, self.lista_adj)
+
+
+# ==========================
+# GRAFO ESPARSO COM CONTADORES (MULTIGRAFO)
+# ==========================
+class GrafoEsparsoContado(GrafoEsparso):
+    # Multigrafo em que cada vértice guarda vizinho -> multiplicidade e o
+    # número de laços, em vez de uma lista com uma entrada por aresta.
+    # Inserir, remover e consultar a multiplicidade custam O(1); as demais
+    # consultas vêm dos Invariantes herdados de GrafoEsparso.
+    def __init__(self, vertices):
+        self.vertices = vertices
+        self.indice = {v: i for i, v in enumerate(vertices)}
+        self.adj = {v: {} for v in vertices}
+        self.lacos = {v: 0 for v in vertices}
+        self.inv = Invariantes(len(vertices))
+        self.versao = 0
+
+    def adicionar_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        if u == v:
+            self.lacos[u] += 1
+            self.inv.adicionar(i, j, 0)
+        else:
+            m = self.adj[u].get(v, 0)
+            self.adj[u][v] = self.adj[v][u] = m + 1
+            self.inv.adicionar(i, j, m)
+        self.versao += 1
+
+    def remover_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        if u == v:
+            if self.lacos[u] == 0:
+                return
+            self.lacos[u] -= 1
+            self.inv.remover(i, j, 0)
+        else:
+            m = self.adj[u].get(v, 0)
+            if m == 0:
+                return
+            if m == 1:
+                del self.adj[u][v]
+                del self.adj[v][u]
+            else:
+                self.adj[u][v] = self.adj[v][u] = m - 1
+            self.inv.remover(i, j, m)
+        self.versao += 1
+
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        # aqui basta gravar a multiplicidade final de cada par
+        vertices = self.vertices
+        mudancas = []
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = self.multiplicidade(vertices[i], vertices[j])
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if a != k:
+                mudancas.append((i, j, m, m - k + a))
+        feitas = []
+        try:
+            for i, j, m, depois in mudancas:
+                feitas.append((i, j, m))
+                self._definir(vertices[i], vertices[j], depois)
+        except BaseException:
+            for i, j, m in reversed(feitas):
+                self._definir(vertices[i], vertices[j], m)
+            raise
+        self.inv.aplicar_lote(mudancas)
+        if mudancas:
+            self.versao += 1
+        return inseridas, removidas
+
+    def _definir(self, u, v, m):
+        if u == v:
+            self.lacos[u] = m
+        elif m:
+            self.adj[u][v] = self.adj[v][u] = m
+        else:
+            self.adj[u].pop(v, None)
+            self.adj[v].pop(u, None)
+
+    def multiplicidade(self, u, v):
+        if u == v:
+            return self.lacos[u]
+        return self.adj[u].get(v, 0)
+
+    def tem_aresta(self, u, v):
+        return self.multiplicidade(u, v) > 0
+
+    def vizinhos(self, u):
+        if self.lacos[u]:
+            return list(self.adj[u]) + [u]
+        return self.adj[u].keys()
+
+    def iter_arestas(self, multiplicidade=False):
+        return _iter_arestas(self, multiplicidade)
+
+    def _vizinhos(self, v):
+        # vizinhos expandidos, no mesmo formato de GrafoEsparso.lista_adj
+        for w, m in self.adj[v].items():
+            for _ in range(m):
+                yield w
+        for _ in range(2 * self.lacos[v]):
+            yield v
+
+    def mostrar(self):
+        print("Lista de Adjacência (multiplicidades):")
+        for v in self.vertices:
+            print(v, ":", self.adj[v], "laços:", self.lacos[v])
+
+    def get_arestas(self):
+        arestas = set()
+        for u in self.vertices:
+            for v in self.adj[u]:
+                arestas.add(tuple(sorted((u, v))))
+            if self.lacos[u]:
+                arestas.add((u, u))
+        return list(arestas)
+
+    def freeze(self):
+        return GrafoCSR(self.vertices, {v: list(self._vizinhos(v)) for v in self.vertices})
+
+
+# ==========================
+# GRAFO ESPARSO COMPACTO (ÍNDICES INTEIROS)
+# ==========================
+class GrafoEsparsoCompacto(Grafo):
+    # Mesma lista de adjacência de GrafoEsparso (laço aparece duas vezes),
+    # mas com os rótulos trocados por índices uma única vez: adj[i] é um
+    # array("i") ordenado com os índices dos vizinhos de i, 4 bytes por
+    # entrada em vez de um ponteiro na lista mais o dicionário de
+    # multiplicidades. A multiplicidade é contada por busca binária e a
+    # inserção/remoção desloca o array (O(grau), em C). Os rótulos só são
+    # traduzidos na entrada e na saída dos métodos.
+    __slots__ = ("vertices", "indice", "adj", "inv", "versao", "__weakref__")
+
+    def __init__(self, vertices):
+        self.vertices = vertices
+        self.indice = {v: i for i, v in enumerate(vertices)}
+        self.adj = [array("i") for _ in vertices]
+        self.inv = Invariantes(len(vertices))
+        self.versao = 0
+
+    def _mult(self, i, j):
+        a = self.adj[i]
+        k = bisect_right(a, j) - bisect_left(a, j)
+        return k // 2 if i == j else k
+
+    def adicionar_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        self.inv.adicionar(i, j, self._mult(i, j))
+        insort(self.adj[i], j)
+        insort(self.adj[j], i)
+        self.versao += 1
+
+    # Inserção em massa (carregar, texto_para_binario): cada array afetado é refeito uma vez
+    def adicionar_arestas(self, arestas):
+        self.aplicar_lote(arestas)
+
+    def remover_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        m = self._mult(i, j)
+        if m == 0:
+            return
+        self.inv.remover(i, j, m)
+        a, b = self.adj[i], self.adj[j]
+        del a[bisect_left(a, j)]
+        del b[bisect_left(b, i)]   # no laço, a segunda entrada do mesmo array
+        self.versao += 1
+
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        adj = self.adj
+        mudancas = []
+        tirar = {}   # i -> {j: ocorrências a retirar de adj[i]}
+        por = {}     # i -> índices a acrescentar em adj[i]
+        inseridas = removidas = 0
+        for (i, j), (a, r) in _agrupar_lote(self.indice, adicoes, remocoes).items():
+            m = self._mult(i, j)
+            k = min(r, m)
+            inseridas += a
+            removidas += k
+            if k:
+                t = tirar.setdefault(i, {})
+                t[j] = t.get(j, 0) + k
+                t = tirar.setdefault(j, {})
+                t[i] = t.get(i, 0) + k
+            if a:
+                por.setdefault(i, []).extend([j] * a)
+                por.setdefault(j, []).extend([i] * a)
+            if a != k:
+                mudancas.append((i, j, m, m - k + a))
+        novos = {}
+        for i in tirar.keys() | por.keys():
+            t = tirar.get(i)
+            if t:
+                nova = []
+                for j in adj[i]:
+                    if t.get(j):
+                        t[j] -= 1
+                    else:
+                        nova.append(j)
+            else:
+                nova = adj[i].tolist()
+            nova.extend(por.get(i, ()))
+            nova.sort()
+            novos[i] = array("i", nova)
+
+        # os arrays novos já estão prontos: só resta trocá-los
+        trocados = {}
+        try:
+            for i, nova in novos.items():
+                trocados[i] = adj[i]
+                adj[i] = nova
+        except BaseException:
+            for i, velho in trocados.items():
+                adj[i] = velho
+            raise
+        self.inv.aplicar_lote(mudancas)
+        if mudancas:
+            self.versao += 1
+        return inseridas, removidas
+
+    def mostrar(self):
+        print("Lista de Adjacência (compacta):")
+        vertices = self.vertices
+        for i, v in enumerate(vertices):
+            print(v, ":", [vertices[j] for j in self.adj[i]])
+
+    def numero_vertices(self):
+        return len(self.vertices)
+
+    def numero_arestas(self):
+        return self.inv.arestas
+
+    def sequencia_graus(self):
+        return list(self.inv.graus)
+
+    def is_simples(self):
+        return self.inv.lacos == 0 and self.inv.pares_multiplos == 0
+
+    def is_nulo(self):
+        return self.inv.arestas == 0
+
+    def is_completo(self):
+        n = len(self.vertices)
+        return self.inv.lacos == 0 and self.inv.pares_distintos == n * (n - 1) // 2
+
+    def get_vertices(self):
+        return self.vertices
+
+    def get_arestas(self):
+        vertices = self.vertices
+        arestas = set()
+        for i, a in enumerate(self.adj):
+            for j in a:
+                if i <= j:
+                    arestas.add(tuple(sorted((vertices[i], vertices[j]))))
+        return list(arestas)
+
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        a = self.adj[i]
+        k = bisect_left(a, j)
+        return k < len(a) and a[k] == j
+
+    def multiplicidade(self, u, v):
+        return self._mult(self.indice[u], self.indice[v])
+
+    def vizinhos_de(self, i):
+        # vizinhos de i como índices, com repetições (mesmo formato de GrafoCSR)
+        return self.adj[i]
+
+    def vizinhos(self, u):
+        vertices = self.vertices
+        distintos = []
+        anterior = -1
+        for j in self.adj[self.indice[u]]:
+            if j != anterior:
+                distintos.append(vertices[j])
+                anterior = j
+        return distintos
+
+    def iter_arestas(self, multiplicidade=False):
+        # percorre os arrays direto, sem passar pelos rótulos de cada vizinho
+        vertices = self.vertices
+        for i, a in enumerate(self.adj):
+            ini = bisect_left(a, i)
+            while ini < len(a):
+                j = a[ini]
+                fim = bisect_right(a, j, ini)
+                if multiplicidade:
+                    m = fim - ini
+                    yield vertices[i], vertices[j], m // 2 if i == j else m
+                else:
+                    yield vertices[i], vertices[j]
+                ini = fim
+
+    def is_subgrafo(self, outro_grafo):
+        return _is_subgrafo(self, outro_grafo)
+
+    def is_subgrafo_gerador(self, outro_grafo):
+        return _is_subgrafo_gerador(self, outro_grafo)
+
+    def is_subgrafo_induzido(self, outro_grafo):
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+    def subgrafo_induzido(self, vertices):
+        return VisaoInduzida(self, vertices)
+
+    def subgrafo_gerador(self, arestas):
+        return VisaoGeradora(self, arestas)
+
+    def complemento(self):
+        return VisaoComplemento(self)
+
+    def freeze(self):
+        return GrafoCSR.de_indices(self.vertices, self.adj)
+
+
+# ==========================
+# GRAFO ESPARSO CONGELADO (CSR)
+# ==========================
+class GrafoCSR:
+    # Visão somente leitura em formato CSR (compressed sparse row): os
+    # vizinhos do vértice i ficam em alvos[inicio[i]:inicio[i+1]], como
+    # índices ordenados na tabela de rótulos. Cada aresta aparece nas duas
+    # pontas e cada laço aparece duas vezes, como em GrafoEsparso.lista_adj.
+    versao = 0   # imutável
+
+    def __init__(self, vertices, lista_adj):
+        self.vertices = tuple(vertices)
+        self.indice = {v: i for i, v in enumerate(self.vertices)}
+        self.inicio = array("l", [0])
+        self.alvos = array("i")
+        indice = self.indice
+        for v in self.vertices:
+            self.alvos.extend(sorted(indice[w] for w in lista_adj[v]))
+            self.inicio.append(len(self.alvos))
+
+    @classmethod
+    def de_indices(cls, vertices, listas):
+        # listas[i]: vizinhos de i já como índices ordenados (nada a traduzir)
+        g = cls.__new__(cls)
+        g.vertices = tuple(vertices)
+        g.indice = {v: i for i, v in enumerate(g.vertices)}
+        g.inicio = array("l", [0])
+        g.alvos = array("i")
+        for lista in listas:
+            g.alvos.extend(lista)
+            g.inicio.append(len(g.alvos))
+        return g
+
+    def vizinhos_de(self, i):
+        return self.alvos[self.inicio[i]:self.inicio[i + 1]]
+
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        k = bisect_left(self.alvos, j, self.inicio[i], self.inicio[i + 1])
+        return k < self.inicio[i + 1] and self.alvos[k] == j
+
+    def multiplicidade(self, u, v):
+        i, j = self.indice[u], self.indice[v]
+        ini, fim = self.inicio[i], self.inicio[i + 1]
+        k = bisect_right(self.alvos, j, ini, fim) - bisect_left(self.alvos, j, ini, fim)
+        return k if i != j else k // 2   # laço aparece duas vezes
+
+    def vizinhos(self, u):
+        distintos = []
+        for j in self.vizinhos_de(self.indice[u]):
+            if not distintos or distintos[-1] != j:
+                distintos.append(j)
+        return [self.vertices[j] for j in distintos]
+
+    def iter_arestas(self, multiplicidade=False):
+        return _iter_arestas(self, multiplicidade)
+
+    def mostrar(self):
+        print("Lista de Adjacência (CSR):")
+        for i, v in enumerate(self.vertices):
+            print(v, ":", [self.vertices[j] for j in self.vizinhos_de(i)])
+
+    def numero_vertices(self):
+        return len(self.vertices)
+
+    def numero_arestas(self):
+        return len(self.alvos) // 2
+
+    def sequencia_graus(self):
+        inicio = self.inicio
+        return [inicio[i + 1] - inicio[i] for i in range(len(self.vertices))]
+
+    def is_simples(self):
+        # vizinhos ordenados: laço é o próprio índice e aresta múltipla é repetição vizinha
+        inicio, alvos = self.inicio, self.alvos
+        for i in range(len(self.vertices)):
+            anterior = -1
+            for k in range(inicio[i], inicio[i + 1]):
+                j = alvos[k]
+                if j == i or j == anterior:
+                    return False
+                anterior = j
+        return True
+
+    def is_nulo(self):
+        return len(self.alvos) == 0
+
+    def is_completo(self):
+        n = len(self.vertices)
+        inicio, alvos = self.inicio, self.alvos
+        # sem laços e com os n - 1 outros vértices entre os vizinhos distintos
+        for i in range(n):
+            distintos = 0
+            anterior = -1
+            for k in range(inicio[i], inicio[i + 1]):
+                j = alvos[k]
+                if j == i:
+                    return False
+                if j != anterior:
+                    distintos += 1
+                    anterior = j
+            if distintos != n - 1:
+                return False
+        return True
+
+    def get_vertices(self):
+        return list(self.vertices)
+
+    def get_arestas(self):
+        vertices, inicio, alvos = self.vertices, self.inicio, self.alvos
+        arestas = set()
+        for i in range(len(vertices)):
+            for k in range(inicio[i], inicio[i + 1]):
+                j = alvos[k]
+                if i <= j:
+                    arestas.add(tuple(sorted((vertices[i], vertices[j]))))
+        return list(arestas)
+
     def is_subgrafo(self, outro_grafo):
-        return (set(self.get_vertices()).issubset(set(outro_grafo.get_vertices())) and
-                set(self.get_arestas()).issubset(set(outro_grafo.get_arestas())))
+        return _is_subgrafo(self, outro_grafo)
 
     def is_subgrafo_gerador(self, outro_grafo):
-        return (set(self.get_vertices()) == set(outro_grafo.get_vertices()) and
-                set(self.get_arestas()).issubset(set(outro_grafo.get_arestas())))
+        return _is_subgrafo_gerador(self, outro_grafo)
 
     def is_subgrafo_induzido(self, outro_grafo):
-        if not set(self.get_vertices()).issubset(set(outro_grafo.get_vertices())):
-            return False
-        arestas_outro = set(outro_grafo.get_arestas())
-        arestas_induzidas = set()
-        for u in self.get_vertices():
-            for v in self.get_vertices():
-                if u != v and (tuple(sorted((u, v))) in arestas_outro):
-                    arestas_induzidas.add(tuple(sorted((u, v))))
-        return set(self.get_arestas()) == arestas_induzidas
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+
+# ==========================
+# GRAFO ADAPTATIVO (DENSO <-> ESPARSO)
+# ==========================
+class GrafoAdaptativo(Grafo):
+    # Escolhe sozinho entre GrafoEsparso e GrafoDenso pela densidade
+    # (pares adjacentes / pares possíveis). Passa para a matriz quando a
+    # densidade supera limite_denso e volta para a lista quando cai abaixo
+    # de limite_esparso; a faixa entre os dois evita migrações repetidas.
+    # As consultas vêm dos Invariantes e da vizinhança em ordem de vértice,
+    # então o resultado não depende da representação atual.
+    def __init__(self, vertices, limite_denso=0.25, limite_esparso=0.1):
+        if not 0 <= limite_esparso < limite_denso <= 1:
+            raise ValueError("é preciso 0 <= limite_esparso < limite_denso <= 1")
+        self.vertices = vertices
+        self.indice = {v: i for i, v in enumerate(vertices)}
+        self.limite_denso = limite_denso
+        self.limite_esparso = limite_esparso
+        self.grafo = GrafoEsparso(vertices)
+        self.migracoes = 0
+        self.versao = 0   # própria: a do grafo interno recomeça a cada migração
+
+    @property
+    def representacao(self):
+        return "densa" if isinstance(self.grafo, GrafoDenso) else "esparsa"
+
+    def densidade(self):
+        n = len(self.vertices)
+        return self.grafo.inv.pares_distintos / (n * (n - 1) // 2) if n > 1 else 0.0
+
+    def _ajustar(self):
+        d = self.densidade()
+        if isinstance(self.grafo, GrafoDenso):
+            if d < self.limite_esparso:
+                self._migrar(GrafoEsparso)
+        elif d > self.limite_denso:
+            self._migrar(GrafoDenso)
+
+    def _migrar(self, classe):
+        antigo, novo = self.grafo, classe(self.vertices)
+        indice = self.indice
+        for u in self.vertices:
+            i = indice[u]
+            for w in antigo.vizinhos(u):
+                if indice[w] >= i:
+                    for _ in range(antigo.multiplicidade(u, w)):
+                        novo.adicionar_aresta(u, w)
+        self.grafo = novo
+        self.migracoes += 1
+
+    def _mudou(self, antes):
+        # a versão do grafo interno só anda quando algo muda de fato
+        if self.grafo.versao != antes:
+            self.versao += 1
+
+    def adicionar_aresta(self, u, v):
+        antes = self.grafo.versao
+        self.grafo.adicionar_aresta(u, v)
+        self._mudou(antes)
+        self._ajustar()
+
+    def adicionar_arestas(self, arestas):
+        antes = self.grafo.versao
+        try:
+            for u, v in arestas:
+                self.grafo.adicionar_aresta(u, v)
+        finally:
+            self._mudou(antes)
+        self._ajustar()
+
+    def remover_aresta(self, u, v):
+        antes = self.grafo.versao
+        self.grafo.remover_aresta(u, v)
+        self._mudou(antes)
+        self._ajustar()
+
+    def aplicar_lote(self, adicoes=(), remocoes=()):
+        # a densidade só é reavaliada (e a representação trocada) no fim do lote
+        antes = self.grafo.versao
+        resultado = self.grafo.aplicar_lote(adicoes, remocoes)
+        self._mudou(antes)
+        self._ajustar()
+        return resultado
+
+    def mostrar(self):
+        print(f"Representação {self.representacao}")
+        self.grafo.mostrar()
+
+    def numero_vertices(self):
+        return len(self.vertices)
+
+    def numero_arestas(self):
+        return self.grafo.inv.arestas
+
+    def sequencia_graus(self):
+        return list(self.grafo.inv.graus)
+
+    def is_simples(self):
+        return self.grafo.inv.lacos == 0 and self.grafo.inv.pares_multiplos == 0
+
+    def is_nulo(self):
+        return self.grafo.inv.arestas == 0
+
+    def is_completo(self):
+        n = len(self.vertices)
+        return self.grafo.inv.lacos == 0 and self.grafo.inv.pares_distintos == n * (n - 1) // 2
+
+    def get_vertices(self):
+        return self.vertices
+
+    def get_arestas(self):
+        # pares distintos (laços incluídos) em ordem de vértice
+        arestas = []
+        for u in self.vertices:
+            i = self.indice[u]
+            for w in self.vizinhos(u):
+                if self.indice[w] >= i:
+                    arestas.append((u, w))
+        return arestas
+
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        return bool(self.grafo.tem_aresta(u, v))
+
+    def multiplicidade(self, u, v):
+        return self.grafo.multiplicidade(u, v)
+
+    def vizinhos(self, u):
+        return sorted(self.grafo.vizinhos(u), key=self.indice.__getitem__)
+
+    def iter_arestas(self, multiplicidade=False):
+        return _iter_arestas(self, multiplicidade)
+
+    def is_subgrafo(self, outro_grafo):
+        return _is_subgrafo(self, outro_grafo)
+
+    def is_subgrafo_gerador(self, outro_grafo):
+        return _is_subgrafo_gerador(self, outro_grafo)
+
+    def is_subgrafo_induzido(self, outro_grafo):
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+
+# ==========================
+# VISÕES (SUBGRAFOS SEM CÓPIA)
+# ==========================
+class _Visao:
+    # Base das visões somente leitura: as subclasses definem vertices,
+    # indice, vizinhos e multiplicidade lendo direto do grafo de origem, e
+    # as consultas da interface são calculadas a partir deles a cada
+    # chamada (nada é copiado; mudanças na origem aparecem na visão).
+    @property
+    def versao(self):
+        return self.grafo.versao
+
+    def numero_vertices(self):
+        return len(self.vertices)
+
+    def get_vertices(self):
+        return self.vertices
+
+    def tem_vertice(self, v):
+        return v in self.indice
+
+    def tem_aresta(self, u, v):
+        return self.multiplicidade(u, v) > 0
+
+    def iter_arestas(self, multiplicidade=False):
+        return _iter_arestas(self, multiplicidade)
+
+    def get_arestas(self):
+        return list(self.iter_arestas())
+
+    def numero_arestas(self):
+        return sum(m for _, _, m in self.iter_arestas(True))
+
+    def sequencia_graus(self):
+        graus = []
+        for u in self.vertices:
+            grau = 0
+            for w in self.vizinhos(u):
+                grau += self.multiplicidade(u, w) * (2 if w == u else 1)   # laço conta 2
+            graus.append(grau)
+        return graus
+
+    def is_simples(self):
+        return all(u != w and m == 1 for u, w, m in self.iter_arestas(True))
+
+    def is_nulo(self):
+        return next(self.iter_arestas(), None) is None
+
+    def is_completo(self):
+        n = len(self.vertices)
+        pares = 0
+        for u, w in self.iter_arestas():
+            if u == w:
+                return False
+            pares += 1
+        return pares == n * (n - 1) // 2
+
+    def mostrar(self):
+        print("Lista de Adjacência (visão):")
+        for u in self.vertices:
+            print(u, ":", list(self.vizinhos(u)))
+
+    def is_subgrafo(self, outro_grafo):
+        return _is_subgrafo(self, outro_grafo)
+
+    def is_subgrafo_gerador(self, outro_grafo):
+        return _is_subgrafo_gerador(self, outro_grafo)
+
+    def is_subgrafo_induzido(self, outro_grafo):
+        return _is_subgrafo_induzido(self, outro_grafo)
+
+
+class VisaoInduzida(_Visao):
+    # Subgrafo induzido por um subconjunto de vértices da origem
+    def __init__(self, grafo, vertices):
+        self.grafo = grafo
+        self.vertices = list(vertices)
+        self.indice = {v: i for i, v in enumerate(self.vertices)}
+        if len(self.indice) != len(self.vertices):
+            raise ValueError("vértices repetidos")
+        for v in self.vertices:
+            if not grafo.tem_vertice(v):
+                raise ValueError(f"vértice {v!r} não pertence ao grafo")
+
+    def vizinhos(self, u):
+        if u not in self.indice:
+            raise KeyError(u)
+        return [w for w in self.grafo.vizinhos(u) if w in self.indice]
+
+    def multiplicidade(self, u, v):
+        if u not in self.indice or v not in self.indice:
+            raise KeyError(u if u not in self.indice else v)
+        return self.grafo.multiplicidade(u, v)
+
+
+class VisaoGeradora(_Visao):
+    # Subgrafo gerador: todos os vértices da origem, só os pares aceitos.
+    # arestas é um filtro f(u, v) -> bool ou uma coleção de pares (u, v);
+    # um par mantido conserva a multiplicidade que tem na origem.
+    def __init__(self, grafo, arestas):
+        self.grafo = grafo
+        self.vertices = grafo.get_vertices()
+        self.indice = grafo.indice
+        if callable(arestas):
+            self.manter = arestas
+        else:
+            pares = {frozenset(e) for e in arestas}
+            self.manter = lambda u, v: frozenset((u, v)) in pares
+
+    def vizinhos(self, u):
+        return [w for w in self.grafo.vizinhos(u) if self.manter(u, w)]
+
+    def multiplicidade(self, u, v):
+        m = self.grafo.multiplicidade(u, v)
+        return m if m and self.manter(u, v) else 0
+
+
+class VisaoComplemento(_Visao):
+    # Complemento simples: u != v são adjacentes (uma vez) se não o forem na origem
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.vertices = grafo.get_vertices()
+        self.indice = grafo.indice
+
+    def vizinhos(self, u):
+        tem_aresta = self.grafo.tem_aresta
+        return [w for w in self.vertices if w != u and not tem_aresta(u, w)]
+
+    def multiplicidade(self, u, v):
+        if v not in self.indice:
+            raise KeyError(v)
+        return int(u != v and not self.grafo.tem_aresta(u, v))
+
+
+# ==========================
+# CONSULTAS MEMORIZADAS
+# ==========================
+def _congelar(resultado):
+    # listas viram tuplas e conjuntos viram frozenset: o que está no cache não pode ser alterado
+    if isinstance(resultado, list):
+        return tuple(resultado)
+    if isinstance(resultado, set):
+        return frozenset(resultado)
+    return resultado
+
+
+class MemoConsultas:
+    # Cache LRU de consultas derivadas (sequencia_graus, is_simples,
+    # is_completo, get_arestas, ...) de qualquer grafo com atributo versao.
+    # Cada resultado é guardado com a versão em que foi calculado; como toda
+    # mutação incrementa a versão, uma entrada velha nunca é devolvida e é
+    # recalculada na próxima consulta. orcamento limita o total de itens
+    # guardados (elementos de cada tupla; 1 para valores simples) e, quando
+    # passa dele, saem as entradas usadas há mais tempo. O grafo é guardado
+    # por referência fraca, então o cache não o mantém vivo.
+    def __init__(self, orcamento=1 << 20):
+        self.orcamento = orcamento
+        self.ocupado = 0
+        self.entradas = OrderedDict()   # (id(grafo), consulta) -> (ref, versão, resultado, custo)
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def consultar(self, grafo, consulta):
+        chave = (id(grafo), consulta)
+        versao = grafo.versao
+        entrada = self.entradas.get(chave)
+        if entrada is not None:
+            ref, versao_guardada, resultado, _ = entrada
+            if ref() is grafo and versao_guardada == versao:
+                self.entradas.move_to_end(chave)
+                self.acertos += 1
+                return resultado
+            self._remover(chave)   # versão antiga ou id reaproveitado por outro grafo
+        self.faltas += 1
+        resultado = _congelar(getattr(grafo, consulta)())
+        custo = len(resultado) if isinstance(resultado, (tuple, frozenset)) else 1
+        if custo <= self.orcamento:
+            self.entradas[chave] = (weakref.ref(grafo), versao, resultado, custo)
+            self.ocupado += custo
+            while self.ocupado > self.orcamento:
+                self._remover(next(iter(self.entradas)))
+                self.descartes += 1
+        return resultado
+
+    def _remover(self, chave):
+        self.ocupado -= self.entradas.pop(chave)[3]
+
+    def limpar(self):
+        self.entradas.clear()
+        self.ocupado = 0
+
+    def estatisticas(self):
+        return {"acertos": self.acertos, "faltas": self.faltas, "descartes": self.descartes,
+                "entradas": len(self.entradas), "ocupado": self.ocupado, "orcamento": self.orcamento}
 
 
 # ==========================
@@ -1,6 +1,41 @@
-from itertools import permutations, product
-from collections import defaultdict
-from typing import List, Tuple, Dict, Optional
+import hashlib
+import multiprocessing
+import os
+import struct
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from heapq import heappush, heappop
+from math import factorial
+from typing import List, Tuple, Dict, Optional, Iterator, Iterable, Sequence, Callable, Protocol, Generator, NamedTuple
+
+
+class AdjacencySource(Protocol):
+    """
+    O que are_isomorphic e os demais algoritmos do módulo leem de um grafo:
+    rótulos V na ordem dos índices, n, neighbors(i) com pares (j,
+    multiplicidade) (um laço em i aparece como (i, número de laços)),
+    degrees() (laço conta 1) e num_edges(). Graph e GraphView implementam.
+    """
+    V: List
+    n: int
+
+    def num_vertices(self) -> int: ...
+
+    def num_edges(self) -> int: ...
+
+    def degrees(self) -> List[int]: ...
+
+    def neighbors(self, i: int) -> Iterable[Tuple[int, int]]: ...
+
+
+class AutomorphismGroup(NamedTuple):
+    generators: List[Dict]      # automorfismos {rótulo: rótulo} que geram o grupo
+    orbits: List[List]          # órbitas dos vértices (listas de rótulos)
+    order: int                  # número de automorfismos
+
 
 class Graph:
     def __init__(self, vertices: List, edges: List[Tuple]):
@@ -13,6 +48,7 @@ class Graph:
             self.A[i][j] += 1
             if i != j:
                 self.A[j][i] += 1  # não direcional
+        self._degrees: Optional[Tuple[int, ...]] = None
 
     def num_vertices(self) -> int:
         return self.n
@@ -26,75 +62,1313 @@ class Graph:
         return soma
 
     def degrees(self) -> List[int]:
-        return [sum(self.A[i]) for i in range(self.n)]
+        # Graph não muda depois de construído: as somas das linhas (O(n²))
+        # são feitas na primeira chamada e as seguintes só copiam a tupla
+        if self._degrees is None:
+            self._degrees = tuple(sum(self.A[i]) for i in range(self.n))
+        return list(self._degrees)
+
+    def neighbors(self, i: int) -> List[Tuple[int, int]]:
+        return [(j, m) for j, m in enumerate(self.A[i]) if m]
 
+    def canonical_form(self) -> Tuple[int, Tuple[Tuple[int, int, int], ...]]:
+        """
+        Forma canônica: (n, arestas (i, j, multiplicidade) com i <= j na
+        numeração canônica, ordenadas). Grafos isomorfos têm formas iguais,
+        então ela pode ser usada como chave de dicionário.
+        """
+        cert, _ = _canonical_labeling(_adjacency(self))
+        return (self.n, cert)
+
+    def canonical_hash(self) -> str:
+        # sha256 da forma canônica serializada (bytes idênticos para grafos isomorfos)
+        n, cert = self.canonical_form()
+        flat = [n, len(cert)]
+        for t in cert:
+            flat.extend(t)
+        return hashlib.sha256(struct.pack("<%dq" % len(flat), *flat)).hexdigest()
+
+    def automorphism_group(self) -> AutomorphismGroup:
+        """
+        Grupo de automorfismos: geradores, órbitas dos vértices e ordem,
+        sem enumerar os automorfismos (ver _automorphism_group).
+        """
+        gens, roots, order = _automorphism_group(_adjacency(self))
+        orbits = defaultdict(list)
+        for i, r in enumerate(roots):
+            orbits[r].append(self.V[i])
+        return AutomorphismGroup([{self.V[i]: self.V[j] for i, j in enumerate(p)} for p in gens],
+                                 list(orbits.values()), order)
+
+
+class GraphView:
+    """
+    Adaptador de AdjacencySource para os grafos de interface3 (GrafoDenso,
+    GrafoEsparso, GrafoEsparsoContado, GrafoEsparsoCompacto, GrafoCSR,
+    GrafoAdaptativo), lidos por get_vertices, vizinhos e multiplicidade:
+    nada de matriz n x n, então a memória é O(n + m) nas classes esparsas,
+    e as arestas múltiplas são preservadas (get_arestas as descartaria). Em
+    interface3 um laço soma 2 ao grau; aqui ele conta 1, como em Graph.A,
+    para que as duas famílias possam ser comparadas entre si.
+    """
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.V = list(grafo.get_vertices())
+        self.n = len(self.V)
+        self.idx = {v: i for i, v in enumerate(self.V)}
+
+    def num_vertices(self) -> int:
+        return self.n
 
-def _compatible_by_degrees(g1: Graph, g2: Graph) -> bool:
+    def num_edges(self) -> int:
+        return sum(m for i in range(self.n) for j, m in self.neighbors(i) if i <= j)
+
+    def degrees(self) -> List[int]:
+        return [sum(m for _, m in self.neighbors(i)) for i in range(self.n)]
+
+    def neighbors(self, i: int) -> List[Tuple[int, int]]:
+        u, g, idx = self.V[i], self.grafo, self.idx
+        return [(idx[w], int(g.multiplicidade(u, w))) for w in g.vizinhos(u)]
+
+
+class SearchStats:
+    """
+    Estatísticas opcionais de are_isomorphic e isomorphism_classes (passe
+    stats=SearchStats() para ativar; sem ele nada é medido). timings guarda
+    os segundos de cada fase ("invariants", "partition", "search",
+    "verify"), sem contar as fases internas. Contadores da busca:
+    candidates (gerados), pruned (descartados pela checagem de
+    viabilidade), nodes (pares aceitos / nós da rotulação canônica),
+    backtracks, verified e rejected (chamadas de _check_mapping e quantas
+    falharam). Do lote: graphs, buckets (grupos com mais de um grafo) e
+    labelings (rotulações canônicas calculadas). Se progress for dado, é
+    chamado com o próprio objeto a cada 1024 passos da busca e a cada lote
+    de trabalho concluído; phase diz a fase corrente.
+    """
+
+    COUNTERS = ("runs", "candidates", "pruned", "nodes", "backtracks", "verified", "rejected",
+                "graphs", "buckets", "labelings")
+
+    def __init__(self, progress: Optional[Callable[["SearchStats"], None]] = None):
+        self.progress = progress
+        self.timings: Dict[str, float] = {}
+        self.phase: Optional[str] = None
+        self._inner: List[float] = []   # tempo das fases internas, por nível
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+
+    @contextmanager
+    def timing(self, name: str) -> Iterator["SearchStats"]:
+        outer = self.phase
+        self.phase = name
+        self._inner.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            total = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + total - self._inner.pop()
+            if self._inner:
+                self._inner[-1] += total
+            self.phase = outer
+
+    def notify(self) -> None:
+        if self.progress is not None:
+            self.progress(self)
+
+    def merge(self, other: "SearchStats") -> None:
+        # soma as medições de outro objeto (ex.: vindas de um processo de trabalho)
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name, t in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + t
+
+    def as_dict(self) -> Dict:
+        d = {name: getattr(self, name) for name in self.COUNTERS}
+        d["timings"] = dict(self.timings)
+        return d
+
+    def __getstate__(self):
+        # o callback pode não ser serializável; os processos usam um objeto próprio
+        state = dict(self.__dict__)
+        state["progress"] = None
+        return state
+
+    def __repr__(self) -> str:
+        return "SearchStats(%s)" % ", ".join("%s=%r" % kv for kv in self.as_dict().items())
+
+
+def _timing(stats: Optional[SearchStats], name: str):
+    return stats.timing(name) if stats is not None else nullcontext()
+
+
+def _compatible_by_degrees(g1: AdjacencySource, g2: AdjacencySource) -> bool:
     return sorted(g1.degrees()) == sorted(g2.degrees())
 
 
-def _partition_by_degree(A: Graph) -> Dict[int, List[int]]:
-    part = defaultdict(list)
-    degs = A.degrees()
-    for i, d in enumerate(degs):
-        part[d].append(i)
-    return dict(part)
+def _refine(adj: List[Dict[int, int]], colors: List[int], trace: Optional[list] = None) -> List[int]:
+    """
+    Refinamento de cores (Weisfeiler-Lehman 1-dim): a cada rodada a cor de u
+    passa a ser (cor atual, laços, multiconjunto de (cor do vizinho,
+    multiplicidade)) até que nenhuma classe se divida mais. As cores novas
+    são a posição da assinatura na lista ordenada, logo não dependem da
+    rotulação dos vértices. Se trace for dado, recebe a cada rodada as
+    assinaturas com suas contagens (um invariante comparável entre grafos).
+    """
+    num = len(set(colors))
+    while True:
+        sigs = []
+        for u, a in enumerate(adj):
+            sigs.append((colors[u], a.get(u, 0),
+                         tuple(sorted((colors[w], m) for w, m in a.items() if w != u))))
+        rank = {s: k for k, s in enumerate(sorted(set(sigs)))}
+        if trace is not None:
+            trace.append(tuple(sorted(Counter(sigs).items())))
+        colors = [rank[s] for s in sigs]
+        if len(rank) == num:
+            return colors
+        num = len(rank)
+
+
+def _refine_pair(adj1: List[Dict[int, int]], adj2: List[Dict[int, int]],
+                 c1: List[int], c2: List[int]) -> Tuple[List[int], List[int]]:
+    # refina a união disjunta para que as cores dos dois grafos sejam comparáveis
+    n1 = len(adj1)
+    union = adj1 + [{j + n1: m for j, m in a.items()} for a in adj2]
+    colors = _refine(union, c1 + c2)
+    return colors[:n1], colors[n1:]
+
+
+def _individualize(colors: List[int], v: int) -> List[int]:
+    # v vira uma célula unitária logo antes do restante da sua célula
+    new = [2 * c + 1 for c in colors]
+    new[v] -= 1
+    return new
+
+
+def _cell_sizes(colors: List[int]) -> Tuple[int, ...]:
+    count = Counter(colors)
+    return tuple(count[c] for c in sorted(count))
+
+
+def _target_cell(colors: List[int]) -> List[int]:
+    # menor célula não unitária (empate: menor cor)
+    cells = defaultdict(list)
+    for u, c in enumerate(colors):
+        cells[c].append(u)
+    return min((len(cs), c, cs) for c, cs in cells.items() if len(cs) > 1)[2]
+
+
+def _leaf_certificate(adj: List[Dict[int, int]], colors: List[int]) -> Tuple[Tuple[int, int, int], ...]:
+    cert = []
+    for u, a in enumerate(adj):
+        cu = colors[u]
+        for w, m in a.items():
+            if u <= w:
+                cw = colors[w]
+                cert.append((cu, cw, m) if cu <= cw else (cw, cu, m))
+    cert.sort()
+    return tuple(cert)
+
+
+def _orbit_roots(autos: List[List[int]], n: int) -> List[int]:
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for p in autos:
+        for x in range(n):
+            a, b = find(x), find(p[x])
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+    return [find(x) for x in range(n)]
+
+
+def _components(adj: List[Dict[int, int]]) -> List[List[int]]:
+    # componentes conexas (vértices em ordem crescente), por busca em largura
+    comp = [-1] * len(adj)
+    out = []
+    for s in range(len(adj)):
+        if comp[s] >= 0:
+            continue
+        comp[s] = len(out)
+        members = [s]
+        for u in members:
+            for w in adj[u]:
+                if comp[w] < 0:
+                    comp[w] = comp[s]
+                    members.append(w)
+        members.sort()
+        out.append(members)
+    return out
+
+
+def _canonical_labeling(adj: List[Dict[int, int]], stats: Optional[SearchStats] = None,
+                        complement: bool = True) -> Tuple[Tuple[Tuple[int, int, int], ...], List[int]]:
+    """
+    Rotulação canônica. Cada componente conexa é rotulada à parte (ver
+    _canonical_connected) e as componentes são numeradas em sequência, na
+    ordem de (tamanho, certificado): componentes isomorfas ficam vizinhas e
+    com certificados iguais, então grafos sem arestas ou com muitas cópias
+    da mesma componente não passam pela busca como um todo. Uma componente
+    simples com mais da metade dos pares adjacentes é rotulada pelo seu
+    complemento (o mesmo rótulo serve aos dois), que é esparso e costuma
+    se partir em componentes. Retorna (certificado, rótulo canônico de
+    cada vértice). stats, se dado, conta os nós visitados.
+    """
+    n = len(adj)
+    comps = _components(adj)
+    parts = []
+    for members in comps:
+        k = len(members)
+        if k == 1:   # vértice isolado: só os laços
+            u = members[0]
+            parts.append((1, ((0, 0, adj[u][u]),) if u in adj[u] else (), members, [0]))
+            continue
+        if len(comps) == 1:
+            sub = adj
+        else:
+            local = {u: i for i, u in enumerate(members)}
+            sub = [{local[w]: m for w, m in adj[u].items()} for u in members]
+        simple = all(u not in a and all(m == 1 for m in a.values()) for u, a in enumerate(sub))
+        if complement and simple and sum(len(a) for a in sub) > k * (k - 1) // 2:   # soma = 2m
+            co = [{w: 1 for w in range(k) if w != u and w not in a} for u, a in enumerate(sub)]
+            _, lab = _canonical_labeling(co, stats, complement=False)
+            cert = _leaf_certificate(sub, lab)
+        else:
+            cert, lab = _canonical_connected(sub, stats)
+        parts.append((k, cert, members, lab))
+    if len(parts) == 1:
+        return parts[0][1], parts[0][3]
+    parts.sort(key=lambda part: (part[0], part[1]))
+    labels = [0] * n
+    cert = []
+    offset = 0
+    for size, part_cert, members, lab in parts:
+        for u, c in zip(members, lab):
+            labels[u] = offset + c
+        # deslocamentos crescentes: a concatenação já sai ordenada
+        cert.extend((a + offset, b + offset, m) for a, b, m in part_cert)
+        offset += size
+    return tuple(cert), labels
+
+
+class _Node:
+    # nó da árvore de busca de _canonical_connected na pilha explícita
+    __slots__ = ("colors", "cell", "next", "explored", "orbits", "seen", "equal")
+
+    def __init__(self, colors: List[int], equal: bool):
+        self.colors = colors
+        self.cell = _target_cell(colors)
+        self.next = 0            # posição do próximo filho em cell
+        self.explored = []       # filhos já visitados
+        self.orbits = None       # union-find das órbitas dos automorfismos que fixam o caminho
+        self.seen = 0            # automorfismos já considerados em orbits
+        self.equal = equal       # caminho com os mesmos invariantes do melhor
+
+
+def _canonical_connected(adj: List[Dict[int, int]], stats: Optional[SearchStats] = None
+                         ) -> Tuple[Tuple[Tuple[int, int, int], ...], List[int]]:
+    """
+    Rotulação canônica por individualização-refinamento, com pilha
+    explícita (a profundidade não esbarra no limite de recursão). A árvore
+    individualiza vértices da célula alvo e refina; um nó cuja partição é
+    uniforme (_uniform_cells) já é folha: todas as folhas abaixo dele são
+    equivalentes por automorfismo, então as células são numeradas na ordem
+    dos índices e os grupos simétricos das células entram como
+    automorfismos. Entre as folhas vence a de menor chave (tamanhos das
+    células e uniformidade ao longo do caminho, certificado). Folhas com a
+    mesma chave revelam automorfismos, usados para podar filhos da mesma
+    órbita (órbitas mantidas por nó, atualizadas só com os automorfismos
+    novos) e para voltar direto ao ancestral comum.
+    """
+    n = len(adj)
+    best = None   # (certificado, rótulos, invariantes, caminho)
+    autos = []
+    stack = []
+    path = []     # vértice individualizado em cada nível; len(path) == len(stack) - 1 entre os passos
+    invs = []
+
+    def find(parent, x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def leaf(cells, key, equal):
+        # devolve o nível do ancestral comum a que a busca deve voltar, ou None
+        nonlocal best
+        lab = [0] * n
+        k = 0
+        for cell in cells:
+            for u in cell:
+                lab[u] = k
+                k += 1
+            if len(cell) > 1:   # o grupo simétrico da célula fixa o caminho
+                p = list(range(n))
+                p[cell[0]], p[cell[1]] = cell[1], cell[0]
+                autos.append(p)
+            if len(cell) > 2:
+                p = list(range(n))
+                for a, b in zip(cell, cell[1:] + cell[:1]):
+                    p[a] = b
+                autos.append(p)
+        cert = _leaf_certificate(adj, lab)
+        if best is None or not equal or cert < best[0]:
+            best = (cert, lab, invs + [key], list(path))
+            for node in stack:   # o novo melhor passa por todos os nós da pilha
+                node.equal = True
+            return None
+        if cert == best[0]:
+            pos = [0] * n
+            for u, c in enumerate(lab):
+                pos[c] = u
+            autos.append([pos[c] for c in best[1]])
+            common = 0
+            while path[common] == best[3][common]:
+                common += 1
+            return common
+        return None
+
+    def enter(colors, equal):
+        # visita o nó do fim do caminho: folha, poda ou empilha; devolve o nível para voltar
+        if stats is not None:
+            stats.nodes += 1
+        cells = _uniform_cells(adj, colors)
+        key = (_cell_sizes(colors), cells is None)   # uniforme vem antes: ela encerra o caminho
+        depth = len(path)
+        if best is not None and equal:
+            b = best[2][depth]
+            if key > b:
+                return None
+            equal = key == b
+        if cells is not None:
+            return leaf(cells, key, equal)
+        invs.append(key)
+        stack.append(_Node(colors, equal))
+        return None
+
+    def next_child(node):
+        cell = node.cell
+        while node.next < len(cell):
+            w = cell[node.next]
+            node.next += 1
+            if not node.explored:
+                return w
+            if len(autos) > node.seen:
+                for p in autos[node.seen:]:
+                    if all(p[x] == x for x in path):
+                        if node.orbits is None:
+                            node.orbits = list(range(n))
+                        parent = node.orbits
+                        for x in range(n):
+                            a, b = find(parent, x), find(parent, p[x])
+                            if a != b:
+                                parent[max(a, b)] = min(a, b)
+                node.seen = len(autos)
+            if node.orbits is not None:
+                r = find(node.orbits, w)
+                if any(find(node.orbits, x) == r for x in node.explored):
+                    continue
+            return w
+        return None
+
+    enter(_refine(adj, [sum(a.values()) for a in adj]), True)
+    while stack:
+        node = stack[-1]
+        w = next_child(node)
+        if w is None:
+            stack.pop()
+            invs.pop()
+            if path:
+                path.pop()
+            continue
+        node.explored.append(w)
+        path.append(w)
+        depth = len(stack)
+        back = enter(_refine(adj, _individualize(node.colors, w)), node.equal)
+        if len(stack) > depth:   # empilhou o filho
+            continue
+        path.pop()
+        if back is not None:
+            while len(stack) > back + 1:
+                stack.pop()
+                invs.pop()
+                path.pop()
+    return best[0], best[1]
+
+
+def _uniform_cells(adj: List[Dict[int, int]], colors: List[int]) -> Optional[List[List[int]]]:
+    """
+    Células da partição, se ela for uniforme: entre duas células (ou dentro
+    de uma) todo par de vértices distintos tem a mesma multiplicidade, e os
+    laços são iguais dentro de cada célula. Então qualquer permutação que
+    preserve as células é um automorfismo. Senão, None. colors deve vir de
+    _refine: a partição é equitativa (vértices da mesma célula têm o mesmo
+    multiconjunto de (cor do vizinho, multiplicidade) e os mesmos laços),
+    então basta olhar um representante por célula.
+    """
+    size = Counter(colors)
+    if len(size) == len(colors):   # discreta: células unitárias
+        return [[u] for _, u in sorted(zip(colors, range(len(colors))))]
+    for cu, u in dict(zip(colors, range(len(colors)))).items():
+        mult = {}
+        count = Counter()
+        for w, m in adj[u].items():
+            if w != u:
+                cw = colors[w]
+                if mult.setdefault(cw, m) != m:
+                    return None
+                count[cw] += 1
+        for cw, k in count.items():
+            if k != size[cw] - (cw == cu):
+                return None
+    cells = defaultdict(list)
+    for u, c in enumerate(colors):
+        cells[c].append(u)
+    return [cells[c] for c in sorted(cells)]
+
+
+def _automorphism_group(adj: List[Dict[int, int]], complement: bool = True
+                        ) -> Tuple[List[List[int]], List[int], int]:
+    """
+    Grupo de automorfismos, componente a componente. Componentes do mesmo
+    tamanho são separadas em classes de isomorfismo pelo certificado de
+    _canonical_labeling (vértices com o mesmo rótulo canônico se
+    correspondem); o grupo de uma classe de k cópias de uma componente de
+    grupo H é o produto entrelaçado H wr S_k, de ordem |H|^k * k!, gerado
+    pelos geradores de H numa cópia, pela troca das duas primeiras cópias e
+    pelo ciclo de todas. Uma componente simples com mais da metade dos
+    pares adjacentes é tratada pelo complemento (mesmo grupo), que é esparso
+    e costuma se partir; as demais vão para _automorphism_connected.
+    Retorna (geradores como listas índice -> índice, raiz da órbita de cada
+    vértice, ordem).
+    """
+    n = len(adj)
+    gens = []
+    roots = list(range(n))
+    order = 1
+    by_size = defaultdict(list)
+    for members in _components(adj):
+        by_size[len(members)].append(members)
+    for k, comps in by_size.items():
+        classes = defaultdict(list)   # certificado -> [(membros, subgrafo, rótulos, vértice de cada rótulo)]
+        for members in comps:
+            if len(by_size) == 1 and len(comps) == 1:
+                sub = adj
+            else:
+                local = {u: i for i, u in enumerate(members)}
+                sub = [{local[w]: m for w, m in adj[u].items()} for u in members]
+            if len(comps) == 1:   # tamanho único: nenhuma outra componente é isomorfa a ela
+                cert, lab = None, list(range(k))
+            else:
+                cert, lab = _canonical_labeling(sub)
+            pos = [0] * k
+            for u, c in zip(members, lab):
+                pos[c] = u
+            classes[cert].append((members, sub, lab, pos))
+
+        for copies in classes.values():
+            members, sub, lab, _ = copies[0]
+            if k == 1:
+                part = ([], [0], 1)
+            elif (complement and sum(len(a) for a in sub) > k * (k - 1) // 2 and   # soma = 2m
+                  all(u not in a and all(m == 1 for m in a.values()) for u, a in enumerate(sub))):
+                co = [{w: 1 for w in range(k) if w != u and w not in a} for u, a in enumerate(sub)]
+                part = _automorphism_group(co, complement=False)
+            else:
+                part = _automorphism_connected(sub)
+            part_gens, part_roots, part_order = part
+            for q in part_gens:
+                p = list(range(n))
+                for u, i in zip(members, q):
+                    p[u] = members[i]
+                gens.append(p)
+            for _, _, _, pos in copies:   # a mesma órbita para vértices de mesmo rótulo
+                for i, r in enumerate(part_roots):
+                    roots[pos[lab[i]]] = members[r]
+            c = len(copies)
+            if c > 1:
+                p = list(range(n))
+                for x, y in zip(copies[0][3], copies[1][3]):
+                    p[x], p[y] = y, x
+                gens.append(p)
+            if c > 2:
+                p = list(range(n))
+                for t in range(c):
+                    for x, y in zip(copies[t][3], copies[(t + 1) % c][3]):
+                        p[x] = y
+                gens.append(p)
+            order *= part_order ** c * factorial(c)
+    return gens, roots, order
+
+
+def _automorphism_connected(adj: List[Dict[int, int]]) -> Tuple[List[List[int]], List[int], int]:
+    """
+    Automorfismos por individualização-refinamento sobre o primeiro caminho
+    da árvore: desce individualizando o primeiro vértice da célula alvo até
+    uma partição uniforme (a discreta é um caso particular), cujo
+    estabilizador é o produto dos grupos simétricos das células. Depois,
+    de baixo para cima, a órbita do vértice individualizado em cada nível
+    é completada: para cada outro vértice w da célula alvo que ainda não
+    está numa órbita conhecida (com ele ou com um w já descartado), busca
+    na subárvore de w uma folha equivalente; o automorfismo achado entra
+    nos geradores e junta órbitas, cortando o resto da busca. A ordem é o
+    produto dos tamanhos dessas órbitas pela ordem do estabilizador final.
+    As buscas usam pilha explícita, como _canonical_connected.
+    """
+    n = len(adj)
+    gens = []
+    parent = list(range(n))
 
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
 
-def _check_mapping(g1: Graph, g2: Graph, mapping: List[int]) -> bool:
-    A1, A2 = g1.A, g2.A
-    n = g1.n
-    for i in range(n):
-        mi = mapping[i]
-        row2 = A2[mi]
-        for k in range(n):
-            if A1[i][k] != row2[mapping[k]]:
+    def add(p):
+        gens.append(p)
+        for x in range(n):
+            a, b = find(x), find(p[x])
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    # primeiro caminho
+    path = []   # (cores, célula alvo) de cada nível
+    invs = []
+    colors = _refine(adj, [sum(a.values()) for a in adj])
+    while True:
+        invs.append(_cell_sizes(colors))
+        cells = _uniform_cells(adj, colors)
+        if cells is not None:
+            break
+        cell = _target_cell(colors)
+        path.append((colors, cell))
+        colors = _refine(adj, _individualize(colors, cell[0]))
+    leaf = colors
+    order = 1
+    for cell in cells:
+        order *= factorial(len(cell))
+        if len(cell) > 1:
+            p = list(range(n))
+            p[cell[0]], p[cell[1]] = cell[1], cell[0]
+            add(p)
+        if len(cell) > 2:
+            p = list(range(n))
+            for a, b in zip(cell, cell[1:] + cell[:1]):
+                p[a] = b
+            add(p)
+    depth_leaf = len(path)
+
+    def to_leaf(colors):
+        # permutação que leva a folha do primeiro caminho a esta (célula a célula)
+        target = defaultdict(list)
+        for u, c in enumerate(colors):
+            target[c].append(u)
+        source = defaultdict(list)
+        for u, c in enumerate(leaf):
+            source[c].append(u)
+        p = [0] * n
+        for c, us in source.items():
+            for u, v in zip(us, target[c]):
+                p[u] = v
+        return p
+
+    def search(colors, depth):
+        # automorfismo que leva o primeiro caminho a algum nó abaixo deste, se existir
+        start = depth
+        stack = []   # [cores, célula alvo, próximo filho] de cada nível aberto
+        while True:
+            if _cell_sizes(colors) == invs[depth]:
+                cells = _uniform_cells(adj, colors)
+                if cells is not None and depth == depth_leaf:
+                    p = to_leaf(colors)
+                    if _check_mapping(adj, adj, p):
+                        return p
+                elif cells is None and depth < depth_leaf:
+                    stack.append([colors, _target_cell(colors), 0])
+            while stack and stack[-1][2] == len(stack[-1][1]):
+                stack.pop()
+            if not stack:
+                return None
+            top = stack[-1]
+            w = top[1][top[2]]
+            top[2] += 1
+            depth = start + len(stack)
+            colors = _refine(adj, _individualize(top[0], w))
+
+    for depth in range(depth_leaf - 1, -1, -1):
+        colors, cell = path[depth]
+        first = cell[0]
+        refuted = set()
+        for w in cell[1:]:
+            r = find(w)
+            if r == find(first) or r in refuted:
+                continue
+            p = search(_refine(adj, _individualize(colors, w)), depth + 1)
+            if p is None:
+                refuted.add(r)
+            else:
+                add(p)
+        root = find(first)
+        order *= sum(1 for w in cell if find(w) == root)
+    return gens, [find(x) for x in range(n)], order
+
+
+def _check_mapping(adj1: List[Dict[int, int]], adj2: List[Dict[int, int]], mapping: List[int]) -> bool:
+    # confere aresta a aresta (com multiplicidade): O(n + m)
+    for i, a in enumerate(adj1):
+        b = adj2[mapping[i]]
+        if len(a) != len(b):
+            return False
+        for j, m in a.items():
+            if b.get(mapping[j]) != m:
                 return False
     return True
 
 
-def are_isomorphic(g1: Graph, g2: Graph) -> Tuple[bool, Optional[Dict]]:
-    if g1.num_vertices() != g2.num_vertices():
-        return (False, None)
-    if g1.num_edges() != g2.num_edges():
+def _adjacency(g: AdjacencySource) -> List[Dict[int, int]]:
+    # vizinhos de cada vértice com a multiplicidade da aresta (laço em i -> i)
+    return [dict(g.neighbors(i)) for i in range(g.n)]
+
+
+def _matching_order(adj: List[Dict[int, int]], rarity: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Ordem de casamento no estilo VF2++: cada componente começa pelo vértice
+    mais raro (menor rarity, ex.: tamanho da classe; empate: maior grau);
+    depois vêm primeiro os vértices com mais vizinhos já ordenados. parent[u] é um vizinho de u que aparece
+    antes dele na ordem (ou -1), usado para gerar os candidatos.
+    """
+    n = len(adj)
+    deg = [sum(a.values()) for a in adj]
+    order = []
+    parent = [-1] * n
+    placed = [False] * n
+    conn = [0] * n
+    roots = sorted(range(n), key=lambda i: (rarity[i], -deg[i], i))
+    for root in roots:
+        if placed[root]:
+            continue
+        heap = [(0, rarity[root], -deg[root], root)]
+        while heap:
+            c, _, _, u = heappop(heap)
+            if placed[u] or -c != conn[u]:
+                continue  # entrada desatualizada
+            placed[u] = True
+            order.append(u)
+            for w in adj[u]:
+                if not placed[w]:
+                    if parent[w] == -1:
+                        parent[w] = u
+                    conn[w] += 1
+                    heappush(heap, (-conn[w], rarity[w], -deg[w], w))
+    return order, parent
+
+
+def _match(adj1: List[Dict[int, int]], adj2: List[Dict[int, int]],
+           cls1: List[int], cls2: List[int], fixed: Sequence[int] = (), split: int = 0,
+           stop: Optional[Callable[[], bool]] = None,
+           stats: Optional[SearchStats] = None,
+           state: Optional["SearchState"] = None) -> Iterator[List[int]]:
+    """
+    Busca com retrocesso que estende um mapeamento parcial g1 -> g2 um
+    vértice por vez. Cada novo par (u, v) só é aceito se os laços e as
+    multiplicidades das arestas para os vértices já mapeados coincidirem,
+    de modo que ramos inviáveis são cortados assim que surgem.
+    Gera todos os mapeamentos completos (lista: índice em g1 -> índice em g2).
+
+    Para dividir a árvore de busca: com split = k, gera em vez disso as
+    imagens viáveis dos k primeiros vértices da ordem; com fixed, a busca
+    começa presa a um desses prefixos. stop é consultado periodicamente e
+    interrompe a busca quando devolve True. stats, se dado, recebe os
+    contadores da busca.
+
+    Com state (SearchState), todo o estado da busca vive nele: a busca
+    retoma de onde o estado parou, pausa quando o orçamento dele acaba e,
+    ao terminar, marca state.depth = -1.
+    """
+    n = len(adj1)
+    if n == 0:
+        fresh = state is None or state.depth == 0
+        if state is not None:
+            state.depth = -1
+        if fresh:
+            yield []
+        return
+    by_class2 = defaultdict(list)
+    for j, c in enumerate(cls2):
+        by_class2[c].append(j)
+    if state is not None and state.order is not None:
+        order, parent = state.order, state.parent
+        core1, core2, cands, pos = state.core1, state.core2, state.cands, state.pos
+        depth = state.depth
+    else:
+        freq = Counter(cls1)
+        order, parent = _matching_order(adj1, [freq[c] for c in cls1])
+        core1 = [-1] * n
+        core2 = [-1] * n
+        cands = [None] * n
+        pos = [0] * n
+        depth = 0
+        if state is not None:
+            state.order, state.parent = order, parent
+            state.core1, state.core2, state.cands, state.pos = core1, core2, cands, pos
+
+    def candidates(depth):
+        u = order[depth]
+        c = cls1[u]
+        if depth < len(fixed):
+            x = fixed[depth]
+            return [x] if core2[x] == -1 and cls2[x] == c else []
+        p = parent[u]
+        if p != -1:
+            return [x for x in sorted(adj2[core1[p]]) if core2[x] == -1 and cls2[x] == c]
+        return [x for x in by_class2[c] if core2[x] == -1]
+
+    def feasible(u, v):
+        a1, a2 = adj1[u], adj2[v]
+        if a1.get(u, 0) != a2.get(v, 0):
+            return False
+        mapped = 0
+        for w, m in a1.items():
+            x = core1[w]
+            if x != -1 and w != u:
+                if a2.get(x, 0) != m:
+                    return False
+                mapped += 1
+        for x in a2:
+            if core2[x] != -1 and x != v:
+                mapped -= 1
+        return mapped == 0
+
+    steps = 0
+    poll = stop is not None or stats is not None
+    if cands[0] is None:
+        cands[0] = candidates(0)
+        if stats is not None:
+            stats.candidates += len(cands[0])
+    while depth >= 0:
+        if state is not None:
+            if state.spent():
+                state.depth = depth
+                return
+            state.steps += 1
+        if poll:
+            steps += 1
+            if steps & 1023 == 0:
+                if stop is not None and stop():
+                    return
+                if stats is not None:
+                    stats.notify()
+        u = order[depth]
+        if core1[u] != -1:  # desfaz a escolha anterior neste nível
+            core2[core1[u]] = -1
+            core1[u] = -1
+        lst = cands[depth]
+        k = pos[depth]
+        while k < len(lst):
+            v = lst[k]
+            k += 1
+            if feasible(u, v):
+                core1[u] = v
+                core2[v] = u
+                break
+        if stats is not None:
+            accepted = core1[u] != -1
+            stats.pruned += k - pos[depth] - accepted
+            stats.nodes += accepted
+            stats.backtracks += not accepted
+        pos[depth] = k
+        if core1[u] == -1:
+            depth -= 1
+            continue
+        if state is not None:
+            state.nodes += 1
+        if depth + 1 == n:
+            if state is not None:
+                state.depth = depth   # ao retomar, tenta o próximo candidato deste nível
+            yield list(core1)
+            continue
+        if depth + 1 == split:
+            yield [core1[w] for w in order[:split]]
+            continue
+        depth += 1
+        cands[depth] = candidates(depth)
+        pos[depth] = 0
+        if stats is not None:
+            stats.candidates += len(cands[depth])
+    if state is not None:
+        state.depth = -1
+
+
+# Estado de cada processo da busca paralela (preenchido por _init_worker)
+_worker_state = {}
+
+
+def _init_worker(found, adj1, adj2, cls1, cls2, collect=False) -> None:
+    _worker_state["found"] = found
+    _worker_state["args"] = (adj1, adj2, cls1, cls2)
+    _worker_state["collect"] = collect
+
+
+def _search_prefix(prefix: List[int]) -> Tuple[Optional[List[int]], Optional[SearchStats]]:
+    found = _worker_state["found"]
+    stats = SearchStats() if _worker_state["collect"] else None
+    if found.is_set():
+        return None, stats
+    for mapping in _match(*_worker_state["args"], fixed=prefix, stop=found.is_set, stats=stats):
+        return mapping, stats
+    return None, stats
+
+
+def _parallel_match(adj1: List[Dict[int, int]], adj2: List[Dict[int, int]],
+                    cls1: List[int], cls2: List[int], workers: int,
+                    stats: Optional[SearchStats] = None) -> Optional[List[int]]:
+    """
+    Divide a árvore de busca pelas imagens dos primeiros vértices da ordem
+    (aprofundando até ter ~4 tarefas por processo) e distribui os prefixos.
+    O primeiro processo que encontra um mapeamento sinaliza um Event
+    compartilhado, e os demais abandonam a busca.
+    """
+    n = len(adj1)
+    prefixes = []
+    for split in range(1, max(min(n, 3), 1) + 1):
+        prefixes = list(_match(adj1, adj2, cls1, cls2, split=split, stats=stats))
+        if len(prefixes) >= 4 * workers:
+            break
+    if not prefixes:
+        return None
+    if len(prefixes[0]) == n:   # a divisão já chegou às folhas
+        return prefixes[0]
+
+    ctx = multiprocessing.get_context()
+    found = ctx.Event()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(found, adj1, adj2, cls1, cls2, stats is not None)) as pool:
+        futures = [pool.submit(_search_prefix, p) for p in prefixes]
+        try:
+            for f in as_completed(futures):
+                mapping, worker_stats = f.result()
+                if stats is not None:
+                    stats.merge(worker_stats)
+                    stats.notify()
+                if mapping is not None:
+                    return mapping
+        finally:
+            found.set()
+            for f in futures:
+                f.cancel()
+    return None
+
+
+def _label_mapping(g1: AdjacencySource, g2: AdjacencySource, mapping: List[int]) -> Dict:
+    return {g1.V[i]: g2.V[mapping[i]] for i in range(g1.n)}
+
+
+def _verify(adj1: List[Dict[int, int]], adj2: List[Dict[int, int]], mapping: List[int],
+            stats: Optional[SearchStats]) -> bool:
+    if stats is None:
+        return _check_mapping(adj1, adj2, mapping)
+    with stats.timing("verify"):
+        ok = _check_mapping(adj1, adj2, mapping)
+    stats.verified += 1
+    stats.rejected += not ok
+    return ok
+
+
+def are_isomorphic(g1: AdjacencySource, g2: AdjacencySource, workers: int = 1,
+                   stats: Optional[SearchStats] = None) -> Tuple[bool, Optional[Dict]]:
+    """
+    Decide se g1 e g2 são isomorfos e devolve (True, mapeamento de rótulos)
+    ou (False, None). Com workers > 1 a busca é repartida entre processos;
+    a resposta é a mesma do caminho sequencial (o mapeamento pode ser outro
+    isomorfismo válido). Aceita qualquer AdjacencySource: Graph, ou
+    GraphView(grafo) para os grafos de interface3. Com stats, acumula nele
+    os tempos por fase e os contadores da busca (ver SearchStats).
+    """
+    if stats is not None:
+        stats.runs += 1
+    with _timing(stats, "invariants"):
+        ok = (g1.num_vertices() == g2.num_vertices() and g1.num_edges() == g2.num_edges()
+              and _compatible_by_degrees(g1, g2))
+    if not ok:
         return (False, None)
-    if not _compatible_by_degrees(g1, g2):
+
+    with _timing(stats, "partition"):
+        adj1, adj2 = _adjacency(g1), _adjacency(g2)
+        cls1, cls2 = _refine_pair(adj1, adj2, g1.degrees(), g2.degrees())
+        ok = Counter(cls1) == Counter(cls2)
+    if not ok:
         return (False, None)
 
-    P1 = _partition_by_degree(g1)
-    P2 = _partition_by_degree(g2)
+    with _timing(stats, "search"):
+        if workers > 1:
+            mapping = _parallel_match(adj1, adj2, cls1, cls2, workers, stats)
+            found = [mapping] if mapping is not None else []
+        else:
+            found = _match(adj1, adj2, cls1, cls2, stats=stats)
+        for mapping in found:
+            if _verify(adj1, adj2, mapping, stats):
+                return (True, _label_mapping(g1, g2, mapping))
 
-    sizes1 = sorted((d, len(P1[d])) for d in P1)
-    sizes2 = sorted((d, len(P2.get(d, []))) for d in P1)
-    if sizes1 != sizes2:
-        return (False, None)
+    return (False, None)
 
-    per_class_perms = []
-    class_pairs = []
-    for d, idxs1 in P1.items():
-        idxs2 = P2[d]
-        per_class_perms.append(permutations(idxs2))
-        class_pairs.append(idxs1)
-
-    for choice in product(*per_class_perms):
-        mapping = [-1] * g1.n
-        ok = True
-        for idxs1, perm2 in zip(class_pairs, choice):
-            if len(idxs1) != len(perm2):
-                ok = False
+
+# ========================
+# ENUMERAÇÃO COM ORÇAMENTO
+# ========================
+class SearchState:
+    """
+    Estado retomável de iter_isomorphisms: partição (cls1, cls2), ordem de
+    casamento e a pilha da busca (mapeamento parcial core1/core2, listas de
+    candidatos e posição em cada nível). Só tem listas de inteiros nos
+    índices de V/idx, então pode ser guardado com pickle e retomado em
+    outro processo. steps, nodes e found acumulam entre as retomadas;
+    depth == -1 indica busca terminada.
+    """
+
+    def __init__(self, g1: AdjacencySource, g2: AdjacencySource):
+        self.shape = (g1.n, g1.num_edges(), g2.n, g2.num_edges())
+        self.cls1: Optional[List[int]] = None
+        self.cls2: Optional[List[int]] = None
+        self.order: Optional[List[int]] = None
+        self.parent: Optional[List[int]] = None
+        self.core1: Optional[List[int]] = None
+        self.core2: Optional[List[int]] = None
+        self.cands: Optional[List[Optional[List[int]]]] = None
+        self.pos: Optional[List[int]] = None
+        self.depth = 0
+        self.steps = 0
+        self.nodes = 0
+        self.found = 0
+        self._limits = (None, None, None)   # passos, nós, instante (desta execução)
+
+    @property
+    def done(self) -> bool:
+        return self.depth == -1
+
+    def budget(self, max_steps: Optional[int] = None, max_nodes: Optional[int] = None,
+               timeout: Optional[float] = None) -> None:
+        # limites relativos ao ponto atual; None = sem limite
+        self._limits = (None if max_steps is None else self.steps + max_steps,
+                        None if max_nodes is None else self.nodes + max_nodes,
+                        None if timeout is None else time.monotonic() + timeout)
+
+    def spent(self) -> bool:
+        steps, nodes, deadline = self._limits
+        return ((steps is not None and self.steps >= steps)
+                or (nodes is not None and self.nodes >= nodes)
+                or (deadline is not None and time.monotonic() >= deadline))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_limits"] = (None, None, None)   # o prazo não vale em outro processo
+        return state
+
+
+def iter_isomorphisms(g1: AdjacencySource, g2: AdjacencySource, state: Optional[SearchState] = None,
+                      max_steps: Optional[int] = None, max_nodes: Optional[int] = None,
+                      timeout: Optional[float] = None, labels: bool = True
+                      ) -> Generator[object, None, Optional[SearchState]]:
+    """
+    Gera, um a um, todos os isomorfismos g1 -> g2 ({rótulo: rótulo}, ou
+    com labels=False a lista índice em g1 -> índice em g2). A busca pode
+    ter orçamento de passos, de nós (pares aceitos) e de tempo (segundos);
+    quando ele acaba, o gerador termina devolvendo (valor de
+    StopIteration) um SearchState, que retoma a busca em outra chamada com
+    state=... sem repetir mapeamentos (ex.: state = yield from
+    iter_isomorphisms(...) num escalonador). Se a enumeração terminou,
+    devolve None. Na retomada os grafos devem ser os mesmos, com os
+    mesmos índices em V.
+    """
+    if state is None:
+        state = SearchState(g1, g2)
+    elif state.shape != (g1.n, g1.num_edges(), g2.n, g2.num_edges()):
+        raise ValueError("o estado não corresponde a estes grafos")
+    if state.done:
+        return None
+
+    if state.cls1 is None:
+        if (g1.n != g2.n or g1.num_edges() != g2.num_edges()
+                or not _compatible_by_degrees(g1, g2)):
+            state.depth = -1
+            return None
+    adj1, adj2 = _adjacency(g1), _adjacency(g2)
+    if state.cls1 is None:
+        cls1, cls2 = _refine_pair(adj1, adj2, g1.degrees(), g2.degrees())
+        if Counter(cls1) != Counter(cls2):
+            state.depth = -1
+            return None
+        state.cls1, state.cls2 = cls1, cls2
+
+    state.budget(max_steps, max_nodes, timeout)
+    for mapping in _match(adj1, adj2, state.cls1, state.cls2, state=state):
+        state.found += 1
+        yield _label_mapping(g1, g2, mapping) if labels else mapping
+    return None if state.done else state
+
+
+def iter_automorphisms(g: AdjacencySource, state: Optional[SearchState] = None,
+                       max_steps: Optional[int] = None, max_nodes: Optional[int] = None,
+                       timeout: Optional[float] = None, labels: bool = True
+                       ) -> Generator[object, None, Optional[SearchState]]:
+    # automorfismos de g (isomorfismos g -> g), com o mesmo orçamento e retomada
+    return (yield from iter_isomorphisms(g, g, state, max_steps, max_nodes, timeout, labels))
+
+
+# ========================
+# CLASSIFICAÇÃO EM LOTE
+# ========================
+def _classify_buckets(buckets: List[List[Tuple[int, List[Dict[int, int]]]]], collect: bool = False
+                      ) -> Tuple[List[Tuple[int, int, List[int]]], Optional[SearchStats]]:
+    """
+    Executado nos processos de trabalho. Cada balde traz (índice global,
+    adjacência) de grafos com os mesmos invariantes baratos; o balde é
+    dividido pelas cores refinadas e, onde sobra mais de um grafo, pela
+    rotulação canônica. Retorna a lista de (índice, índice do
+    representante, mapeamento índice -> índice no representante) de cada
+    grafo e, com collect, as estatísticas do lote.
+    """
+    stats = SearchStats() if collect else None
+    out = []
+    for items in buckets:
+        by_colors = defaultdict(list)
+        with _timing(stats, "partition"):
+            for k, adj in items:
+                trace = []
+                _refine(adj, [sum(a.values()) for a in adj], trace)
+                by_colors[hash(tuple(trace))].append((k, adj))
+        for group in by_colors.values():
+            if len(group) == 1:
+                k, adj = group[0]
+                out.append((k, k, list(range(len(adj)))))
+                continue
+            reps = {}
+            for k, adj in group:
+                with _timing(stats, "search"):
+                    cert, lab = _canonical_labeling(adj, stats)
+                if stats is not None:
+                    stats.labelings += 1
+                if cert not in reps:
+                    reps[cert] = (k, {c: v for v, c in enumerate(lab)})
+                    out.append((k, k, list(range(len(adj)))))
+                else:
+                    r, vertex_at = reps[cert]
+                    out.append((k, r, [vertex_at[c] for c in lab]))
+    return out, stats
+
+
+def isomorphism_classes(graphs: Iterable[AdjacencySource], workers: Optional[int] = None,
+                        chunk_size: int = 256,
+                        stats: Optional[SearchStats] = None) -> Tuple[List[int], List[Dict]]:
+    """
+    Separa uma coleção de grafos em classes de isomorfismo. Os grafos são
+    agrupados por (n, num_edges, graus ordenados) no processo principal; só
+    baldes com mais de um grafo seguem, em lotes de ~chunk_size grafos, para
+    um ProcessPoolExecutor com `workers` processos (1: tudo no processo
+    atual). Retorna (ids, witnesses): ids[k] é a classe do k-ésimo grafo
+    (numeradas na ordem da primeira ocorrência) e witnesses[k] é um
+    isomorfismo {rótulo em graphs[k]: rótulo no representante}, que é o
+    primeiro grafo da classe. Com stats, acumula nele os tempos e
+    contadores, inclusive os dos processos de trabalho (ver SearchStats).
+    """
+    graphs = list(graphs)
+    buckets = defaultdict(list)
+    with _timing(stats, "invariants"):
+        for k, g in enumerate(graphs):
+            buckets[(g.n, g.num_edges(), tuple(sorted(g.degrees())))].append(k)
+    if stats is not None:
+        stats.graphs += len(graphs)
+
+    rep = list(range(len(graphs)))
+    maps = [None] * len(graphs)
+    tasks, task, size = [], [], 0
+    for idxs in buckets.values():
+        if len(idxs) == 1:
+            continue
+        if stats is not None:
+            stats.buckets += 1
+        task.append([(k, _adjacency(graphs[k])) for k in idxs])
+        size += len(idxs)
+        if size >= chunk_size:
+            tasks.append(task)
+            task, size = [], 0
+    if task:
+        tasks.append(task)
+
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    if workers > 1 and len(tasks) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        classify = partial(_classify_buckets, collect=stats is not None)
+        results = pool.map(classify, tasks) if pool else map(classify, tasks)
+        for out, task_stats in results:
+            for k, r, mapping in out:
+                rep[k] = r
+                maps[k] = mapping
+            if stats is not None:
+                stats.merge(task_stats)
+                stats.notify()
+    finally:
+        if pool:
+            pool.shutdown()
+
+    ids, witnesses = [], []
+    class_of = {}
+    for k, g in enumerate(graphs):
+        r = rep[k]
+        if r == k:
+            class_of[k] = len(class_of)
+        ids.append(class_of[r])
+        mapping = maps[k] or range(g.n)
+        witnesses.append({g.V[x]: graphs[r].V[y] for x, y in enumerate(mapping)})
+    return ids, witnesses
+
+
+# ========================
+# SUBGRAFOS (BUSCA DE PADRÕES)
+# ========================
+def _subgraph_candidates(pat: List[Dict[int, int]], host: List[Dict[int, int]],
+                         induced: bool) -> Optional[List[set]]:
+    """
+    Candidatos de cada vértice do padrão: filtro por grau, número de
+    vizinhos distintos e laços, seguido de poda iterativa (consistência de
+    arcos): v só continua candidato de u se, para cada vizinho w de u, v
+    tiver um vizinho candidato de w com multiplicidade suficiente.
+    Retorna None se algum vértice do padrão ficar sem candidatos.
+    """
+    hdeg = [sum(a.values()) for a in host]
+    cands = []
+    for u, a in enumerate(pat):
+        loops = a.get(u, 0)
+        deg = sum(a.values())
+        distinct = len(a) - (1 if loops else 0)
+        c = set()
+        for v, b in enumerate(host):
+            hl = b.get(v, 0)
+            if hdeg[v] < deg or (hl != loops if induced else hl < loops):
+                continue
+            if len(b) - (1 if hl else 0) < distinct:
+                continue
+            c.add(v)
+        if not c:
+            return None
+        cands.append(c)
+
+    changed = True
+    while changed:
+        changed = False
+        for u, a in enumerate(pat):
+            for w, m in a.items():
+                if w == u:
+                    continue
+                cw = cands[w]
+                keep = set()
+                for v in cands[u]:
+                    b = host[v]
+                    if induced:
+                        ok = any(x in cw and b[x] == m for x in b)
+                    else:
+                        ok = any(x in cw and b[x] >= m for x in b)
+                    if ok:
+                        keep.add(v)
+                if len(keep) != len(cands[u]):
+                    if not keep:
+                        return None
+                    cands[u] = keep
+                    changed = True
+    return cands
+
+
+def _subgraph_match(pat: List[Dict[int, int]], host: List[Dict[int, int]],
+                    induced: bool) -> Iterator[List[int]]:
+    # gera cada mapeamento injetor padrão -> hospedeiro (lista de índices)
+    n = len(pat)
+    if n == 0:
+        yield []
+        return
+    if n > len(host):
+        return
+    cands = _subgraph_candidates(pat, host, induced)
+    if cands is None:
+        return
+    order, parent = _matching_order(pat, [len(c) for c in cands])
+    core1 = [-1] * n
+    used = set()
+    # vizinhos de cada u (no padrão) que aparecem antes dele na ordem
+    rank = {u: k for k, u in enumerate(order)}
+    earlier = [[(w, m) for w, m in pat[u].items() if w != u and rank[w] < rank[u]] for u in range(n)]
+
+    def candidates(u):
+        p = parent[u]
+        c = cands[u]
+        if p != -1:
+            return [x for x in sorted(host[core1[p]]) if x in c and x not in used]
+        return [x for x in sorted(c) if x not in used]
+
+    def feasible(u, v, depth):
+        b = host[v]
+        for w, m in earlier[u]:
+            hm = b.get(core1[w], 0)
+            if hm != m if induced else hm < m:
+                return False
+        if induced:
+            # nenhuma aresta extra no hospedeiro entre v e as imagens já fixadas
+            a = pat[u]
+            for k in range(depth):
+                w = order[k]
+                if w not in a and core1[w] in b:
+                    return False
+        return True
+
+    cand_lists = [None] * n
+    pos = [0] * n
+    depth = 0
+    cand_lists[0] = candidates(order[0])
+    while depth >= 0:
+        u = order[depth]
+        if core1[u] != -1:
+            used.discard(core1[u])
+            core1[u] = -1
+        lst = cand_lists[depth]
+        k = pos[depth]
+        while k < len(lst):
+            v = lst[k]
+            k += 1
+            if feasible(u, v, depth):
+                core1[u] = v
+                used.add(v)
                 break
-            for i, j in zip(idxs1, perm2):
-                mapping[i] = j
-        if not ok:
+        pos[depth] = k
+        if core1[u] == -1:
+            depth -= 1
+            continue
+        if depth + 1 == n:
+            yield list(core1)
             continue
+        depth += 1
+        cand_lists[depth] = candidates(order[depth])
+        pos[depth] = 0
 
-        if _check_mapping(g1, g2, mapping):
-            inv1 = {i: v for v, i in g1.idx.items()}
-            inv2 = {i: v for v, i in g2.idx.items()}
-            map_labels = {inv1[i]: inv2[mapping[i]] for i in range(g1.n)}
-            return (True, map_labels)
 
-    return (False, None)
+def find_subgraph_isomorphisms(pattern: AdjacencySource, host: AdjacencySource, induced: bool = False) -> Iterator[Dict]:
+    """
+    Gera, sob demanda, todas as ocorrências de pattern dentro de host como
+    dicionários {rótulo no padrão: rótulo no hospedeiro}. Não induzido: cada
+    aresta do padrão (com sua multiplicidade) precisa existir no
+    hospedeiro; induzido: as multiplicidades entre os vértices escolhidos
+    devem ser exatamente as do padrão. Ocorrências que diferem por um
+    automorfismo do padrão aparecem separadamente.
+    """
+    for mapping in _subgraph_match(_adjacency(pattern), _adjacency(host), induced):
+        yield _label_mapping(pattern, host, mapping)
 
 
 # ========================
@@ -126,3 +1400,7 @@ if __name__ == "__main__":
     g6 = Graph(["u","v"], edges=[("u","v"),("u","v")])
     iso3, mapping3 = are_isomorphic(g5, g6)
     print("Exemplo 3 - Isomorfos (multigrafo)?", iso3, mapping3)
+
+    # Exemplo 4: Grupo de automorfismos do ciclo de 4 (diedral, ordem 8)
+    grupo = g1.automorphism_group()
+    print("Exemplo 4 - Ordem:", grupo.order, "Órbitas:", grupo.orbits)
@@ -0,0 +1,599 @@
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import compress
+
+import Interface
+import interface2
+import interface3
+import iso
+
+# ==========================
+# FORMATO BINÁRIO
+# ==========================
+# Cabeçalho (48 bytes, little-endian):
+#   magic "GRAFOBIN", versão, flags, n, m, posição e tamanho da tabela de rótulos
+# Arestas: int32[2m] intercalados (origem, destino), índices na tabela de rótulos,
+#   começando logo após o cabeçalho (alinhado em 8 bytes)
+# Rótulos: int64[n] se flags & ROTULOS_INT; senão, para cada rótulo,
+#   u32 com o tamanho seguido dos bytes em UTF-8
+# Cada aresta aparece uma vez; arestas múltiplas se repetem e laços têm origem == destino.
+MAGIC = b"GRAFOBIN"
+VERSAO = 1
+ROTULOS_INT = 1
+_CABECALHO = struct.Struct("<8sIIQQQQ")
+_TAMANHO = struct.Struct("<I")
+
+
+# ==========================
+# LEITURA DE LISTAS DE ARESTAS EM TEXTO
+# ==========================
+def _abrir_texto(arquivo):
+    if isinstance(arquivo, (str, bytes, os.PathLike)):
+        return open(arquivo, encoding="utf-8"), True
+    return arquivo, False
+
+
+def ler_arestas(arquivo, separador=None, tamanho_lote=65536, converter=None):
+    """
+    Lê uma lista de arestas em texto (uma aresta "u v" por linha, separada
+    por espaços ou pelo separador dado, ex.: "," para CSV) e gera lotes de
+    até tamanho_lote pares (u, v), sem carregar o arquivo inteiro.
+    Linhas vazias e começadas por '#' são ignoradas; converter (ex.: int)
+    é aplicado a cada rótulo.
+    """
+    f, proprio = _abrir_texto(arquivo)
+    try:
+        lote = []
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            partes = linha.split(separador)
+            if len(partes) < 2:
+                raise ValueError(f"linha {numero}: esperava dois vértices, obteve {linha!r}")
+            u, v = partes[0].strip(), partes[1].strip()
+            if converter is not None:
+                u, v = converter(u), converter(v)
+            lote.append((u, v))
+            if len(lote) >= tamanho_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+    finally:
+        if proprio:
+            f.close()
+
+
+def rotulos_de(arquivo, separador=None, converter=None):
+    # primeira passada: rótulos na ordem em que aparecem
+    vistos = {}
+    for lote in ler_arestas(arquivo, separador, converter=converter):
+        for u, v in lote:
+            vistos.setdefault(u, None)
+            vistos.setdefault(v, None)
+    return list(vistos)
+
+
+def _alimentar(grafo, lotes):
+    if hasattr(grafo, "adicionar_arestas"):
+        for lote in lotes:
+            grafo.adicionar_arestas(lote)
+    else:
+        for lote in lotes:
+            for u, v in lote:
+                grafo.adicionar_aresta(u, v)
+    return grafo
+
+
+def _construir(classe, vertices, lotes):
+    # iso.Graph recebe as arestas no construtor; as demais classes, depois
+    if hasattr(classe, "adicionar_aresta"):
+        return _alimentar(classe(vertices), lotes)
+    return classe(vertices, (e for lote in lotes for e in lote))
+
+
+def carregar(classe, arquivo, vertices=None, separador=None, tamanho_lote=65536, converter=None):
+    """
+    Constrói um grafo de `classe` (GrafoDenso, GrafoEsparso, iso.Graph, ...)
+    a partir de uma lista de arestas em texto, em lotes. Sem `vertices`, o
+    arquivo é lido duas vezes: uma para descobrir os rótulos e outra para
+    inserir as arestas; um objeto de arquivo precisa então aceitar seek.
+    """
+    if vertices is None:
+        proprio = isinstance(arquivo, (str, bytes, os.PathLike))
+        if not proprio and not (hasattr(arquivo, "seekable") and arquivo.seekable()):
+            raise TypeError("sem `vertices`, o arquivo é lido duas vezes: passe um caminho "
+                            "ou um objeto de arquivo que aceite seek")
+        inicio = None if proprio else arquivo.tell()
+        vertices = rotulos_de(arquivo, separador, converter)
+        if inicio is not None:
+            arquivo.seek(inicio)
+    return _construir(classe, vertices, ler_arestas(arquivo, separador, tamanho_lote, converter))
+
+
+# ==========================
+# ESCRITA EM TEXTO (MATRIZ, LISTA, ARESTAS, COO)
+# ==========================
+# Formatos de escrever_texto, uma linha por vértice i (ou por aresta):
+#   "matriz":  as n multiplicidades da linha i separadas por espaço
+#   "lista":   "u: w w x", cada vizinho repetido pela multiplicidade
+#   "arestas": "u w" para cada aresta com i <= j (o formato de ler_arestas)
+#   "coo":     "i j m" para cada par adjacente com i <= j, em índices
+# Em todos, um laço conta uma vez na multiplicidade.
+FORMATOS_TEXTO = ("matriz", "lista", "arestas", "coo")
+_DIGITOS = bytes.maketrans(bytes(range(10)), b"0123456789")
+_BITS = bytes.maketrans(b"01", b"\0\1")
+
+
+def _fonte(grafo):
+    """
+    (rótulos, linha, vizinhanca, laco_dobrado) de qualquer classe do
+    projeto, lidos direto da representação: linha(i) é a linha i da
+    matriz guardada (None nas classes esparsas), vizinhanca(i) gera
+    (j, multiplicidade) para cada vizinho j de i e laco_dobrado indica
+    que a diagonal da matriz guarda 2 por laço (interface2/3).
+    """
+    if isinstance(grafo, interface3.GrafoAdaptativo):
+        return _fonte(grafo.grafo)
+
+    linha = None
+    dobrado = False
+    if isinstance(grafo, iso.Graph):
+        rotulos, linha = grafo.V, grafo.A.__getitem__
+    elif isinstance(grafo, Interface.GrafoDensoBits):
+        rotulos, n, linhas = grafo.rotulos, grafo.n, grafo.linhas
+
+        def linha(i):
+            # bit j da linha vira o byte j (0 ou 1)
+            return format(linhas[i], f"0{n}b")[::-1].encode("ascii").translate(_BITS) if n else b""
+    elif isinstance(grafo, Interface.GrafoDenso):
+        rotulos, linha = grafo.rotulos, grafo.matriz.__getitem__
+    elif isinstance(grafo, interface3.GrafoDensoNumPy):
+        rotulos, matriz, dobrado = grafo.vertices, grafo.matriz, True
+
+        def linha(i):
+            valores = matriz[i]
+            if len(valores) and valores.max() > 255:
+                return valores.tolist()
+            return valores.astype(interface3.np.uint8).tobytes()
+    elif isinstance(grafo, (interface2.GrafoDenso, interface3.GrafoDenso)):
+        rotulos, linha, dobrado = grafo.vertices, grafo.matriz.__getitem__, True
+
+    if linha is not None:
+        def vizinhanca(i):
+            valores = linha(i)
+            for j in compress(range(len(valores)), valores):   # só as células não nulas
+                c = valores[j]
+                yield j, c // 2 if dobrado and j == i else c
+        return rotulos, linha, vizinhanca, dobrado
+
+    if isinstance(grafo, (interface3.GrafoCSR, interface3.GrafoEsparsoCompacto)):
+        rotulos = grafo.vertices
+
+        def vizinhanca(i):
+            # índices ordenados: cada sequência de repetições é um par
+            anterior, m = -1, 0
+            for j in grafo.vizinhos_de(i):
+                if j != anterior:
+                    if m:
+                        yield anterior, m // 2 if anterior == i else m
+                    anterior, m = j, 0
+                m += 1
+            if m:
+                yield anterior, m // 2 if anterior == i else m
+    elif isinstance(grafo, interface3.GrafoEsparsoContado):
+        rotulos, indice = grafo.vertices, grafo.indice
+
+        def vizinhanca(i):
+            u = rotulos[i]
+            for w, m in grafo.adj[u].items():
+                yield indice[w], m
+            if grafo.lacos[u]:
+                yield i, grafo.lacos[u]
+    elif isinstance(grafo, (Interface.GrafoEsparso, interface2.GrafoEsparso, interface3.GrafoEsparso)):
+        if isinstance(grafo, Interface.GrafoEsparso):
+            rotulos, listas = grafo.rotulos, grafo.adj
+        else:
+            rotulos, listas = grafo.vertices, grafo.lista_adj
+        indice = grafo.indice
+
+        def vizinhanca(i):
+            contagem = {}
+            for w in listas[rotulos[i]]:
+                contagem[w] = contagem.get(w, 0) + 1
+            for w, m in contagem.items():
+                j = indice[w]
+                yield j, m // 2 if j == i else m   # laço aparece duas vezes na lista
+    elif hasattr(grafo, "iter_arestas"):   # visões de interface3 e afins
+        rotulos = list(grafo.get_vertices())
+        indice = {v: i for i, v in enumerate(rotulos)}
+
+        def vizinhanca(i):
+            u = rotulos[i]
+            for w in grafo.vizinhos(u):
+                yield indice[w], grafo.multiplicidade(u, w)
+    else:
+        raise TypeError(f"tipo de grafo não suportado: {type(grafo).__name__}")
+    return rotulos, None, vizinhanca, False
+
+
+def _abrir_saida(arquivo):
+    # devolve (write que aceita bytes, arquivo a fechar no fim ou None)
+    if isinstance(arquivo, (str, bytes, os.PathLike)):
+        f = open(arquivo, "wb")
+        return f.write, f
+    if isinstance(arquivo, io.TextIOBase):
+        # sempre pela camada de texto: a codificação e a tradução de fim de
+        # linha são do fluxo (o modo newline nem é consultável), e decodificar
+        # blocos de tamanho_buffer não pesa diante da montagem das linhas
+        return (lambda dados: arquivo.write(dados.decode("utf-8"))), None
+    return arquivo.write, None
+
+
+def escrever_texto(grafo, arquivo, formato="arestas", inicio=0, fim=None, tamanho_buffer=1 << 20):
+    """
+    Escreve as linhas inicio..fim-1 (na ordem dos vértices) de qualquer
+    grafo do projeto em `arquivo` (caminho ou objeto de arquivo, texto ou
+    binário), num dos FORMATOS_TEXTO. A saída é montada em bytes num
+    buffer de tamanho_buffer, despejado por inteiro a cada vez; as linhas
+    da matriz saem da representação sem passar por uma str por célula.
+    Paginar é chamar de novo com o próximo intervalo.
+    """
+    if formato not in FORMATOS_TEXTO:
+        raise ValueError(f"formato desconhecido: {formato!r} (use um de {FORMATOS_TEXTO})")
+    rotulos, linha, vizinhanca, dobrado = _fonte(grafo)
+    n = len(rotulos)
+    fim = n if fim is None else fim
+    if not 0 <= inicio <= fim <= n:
+        raise ValueError(f"intervalo de linhas inválido: [{inicio}, {fim}) com {n} vértices")
+    if formato in ("lista", "arestas"):
+        nomes = [str(v).encode("utf-8") for v in rotulos]
+    espacos = b" " * (n - 1) + b"\n"
+
+    escrever, proprio = _abrir_saida(arquivo)
+    buf = bytearray()
+    try:
+        for i in range(inicio, fim):
+            if formato == "matriz":
+                if linha is not None:
+                    valores = linha(i)
+                else:
+                    valores = [0] * n
+                    for j, m in vizinhanca(i):
+                        valores[j] = m
+                if n and max(valores) < 10:
+                    # um dígito por célula: traduz a linha inteira de uma vez
+                    celulas = bytearray(2 * n)
+                    celulas[0::2] = bytes(valores).translate(_DIGITOS)
+                    celulas[1::2] = espacos
+                    if dobrado:
+                        celulas[2 * i] = 48 + valores[i] // 2
+                    buf += celulas
+                else:
+                    celulas = list(map(str, valores))
+                    if dobrado:
+                        celulas[i] = str(valores[i] // 2)
+                    buf += " ".join(celulas).encode("ascii") + b"\n"
+            elif formato == "lista":
+                buf += nomes[i] + b":"
+                for j, m in vizinhanca(i):
+                    buf += (b" " + nomes[j]) * m
+                buf += b"\n"
+            elif formato == "arestas":
+                for j, m in vizinhanca(i):
+                    if j >= i:
+                        buf += (nomes[i] + b" " + nomes[j] + b"\n") * m
+            else:
+                for j, m in vizinhanca(i):
+                    if j >= i:
+                        buf += b"%d %d %d\n" % (i, j, m)
+            if len(buf) >= tamanho_buffer:
+                escrever(buf)
+                buf = bytearray()
+        if buf:
+            escrever(buf)
+    finally:
+        if proprio is not None:
+            proprio.close()
+        elif hasattr(arquivo, "flush"):
+            arquivo.flush()
+
+
+# ==========================
+# ESCRITA DO FORMATO BINÁRIO
+# ==========================
+def _pares(grafo):
+    """
+    Rótulos do grafo e um iterador de pares (i, j), i <= j, com cada aresta
+    uma vez (arestas múltiplas repetidas), para qualquer uma das classes
+    do projeto.
+    """
+    if isinstance(grafo, iso.Graph):
+        A = grafo.A
+
+        def pares():
+            for i in range(grafo.n):
+                linha = A[i]
+                for j in range(i, grafo.n):
+                    for _ in range(linha[j]):
+                        yield i, j
+        return grafo.V, pares()
+
+    if isinstance(grafo, Interface.GrafoDensoBits):
+        def pares():
+            for i, linha in enumerate(grafo.linhas):
+                linha >>= i
+                j = i
+                while linha:
+                    if linha & 1:
+                        yield i, j
+                    linha >>= 1
+                    j += 1
+        return grafo.rotulos, pares()
+
+    if isinstance(grafo, (interface3.GrafoCSR, interface3.GrafoEsparsoCompacto)):
+        def pares():
+            for i in range(len(grafo.vertices)):
+                lacos = 0
+                for j in grafo.vizinhos_de(i):
+                    if i < j:
+                        yield i, j
+                    elif i == j:
+                        lacos += 1
+                for _ in range(lacos // 2):
+                    yield i, i
+        return grafo.vertices, pares()
+
+    if isinstance(grafo, interface3.GrafoAdaptativo):
+        return _pares(grafo.grafo)
+
+    if isinstance(grafo, interface3.GrafoEsparsoContado):
+        indice = grafo.indice
+
+        def pares():
+            for u in grafo.vertices:
+                i = indice[u]
+                for w, m in grafo.adj[u].items():
+                    j = indice[w]
+                    if i < j:
+                        for _ in range(m):
+                            yield i, j
+                for _ in range(grafo.lacos[u]):
+                    yield i, i
+        return grafo.vertices, pares()
+
+    if isinstance(grafo, (Interface.GrafoDenso, interface2.GrafoDenso, interface3.GrafoDenso)):
+        # Interface.py guarda 1 na diagonal por laço; interface2/3, 2
+        simples = isinstance(grafo, Interface.GrafoDenso)
+        rotulos = grafo.rotulos if simples else grafo.vertices
+        matriz = grafo.matriz
+
+        def pares():
+            for i in range(grafo.n):
+                linha = matriz[i]
+                lacos = int(linha[i]) if simples else int(linha[i]) // 2
+                for _ in range(lacos):
+                    yield i, i
+                for j in range(i + 1, grafo.n):
+                    for _ in range(int(linha[j])):
+                        yield i, j
+        return rotulos, pares()
+
+    if isinstance(grafo, (Interface.GrafoEsparso, interface2.GrafoEsparso, interface3.GrafoEsparso)):
+        if isinstance(grafo, Interface.GrafoEsparso):
+            rotulos, listas = grafo.rotulos, grafo.adj
+        else:
+            rotulos, listas = grafo.vertices, grafo.lista_adj
+        indice = {v: i for i, v in enumerate(rotulos)}
+
+        def pares():
+            for i, u in enumerate(rotulos):
+                lacos = 0
+                for w in listas[u]:
+                    j = indice[w]
+                    if i < j:
+                        yield i, j
+                    elif i == j:
+                        lacos += 1
+                for _ in range(lacos // 2):   # cada laço aparece duas vezes na lista
+                    yield i, i
+        return rotulos, pares()
+
+    if hasattr(grafo, "iter_arestas"):   # visões de interface3 e afins
+        rotulos = list(grafo.get_vertices())
+        indice = {v: i for i, v in enumerate(rotulos)}
+
+        def pares():
+            for u, w, m in grafo.iter_arestas(True):
+                for _ in range(m):
+                    yield indice[u], indice[w]
+        return rotulos, pares()
+
+    raise TypeError(f"tipo de grafo não suportado: {type(grafo).__name__}")
+
+
+def _flags_rotulos(rotulos):
+    # ROTULOS_INT se todos forem int, 0 se todos forem str; senão TypeError
+    if all(type(r) is int for r in rotulos):
+        if rotulos and not -(1 << 63) <= min(rotulos) <= max(rotulos) < 1 << 63:
+            raise TypeError("rótulo inteiro fora do intervalo de 64 bits do formato binário")
+        return ROTULOS_INT
+    for r in rotulos:
+        if not isinstance(r, str):
+            raise TypeError(f"rótulo não suportado no formato binário: {r!r}")
+    return 0
+
+
+class _EscritorBinario:
+    """
+    Escreve as arestas em fluxo e, em concluir(), a tabela de rótulos e o
+    cabeçalho, que fica zerado (arquivo inválido) até lá. Qualquer falha
+    antes disso deve chamar descartar(), que fecha e apaga o arquivo: um
+    salvamento interrompido não deixa para trás um grafo que abre.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.f = open(caminho, "wb")
+        self.f.write(b"\0" * _CABECALHO.size)
+        self.m = 0
+
+    def escrever(self, pares):
+        buf = array("i")
+        for i, j in pares:
+            buf.append(i)
+            buf.append(j)
+            if len(buf) >= 1 << 20:
+                self._despejar(buf)
+                buf = array("i")
+        self._despejar(buf)
+
+    def _despejar(self, buf):
+        if sys.byteorder != "little":
+            buf.byteswap()
+        buf.tofile(self.f)
+        self.m += len(buf) // 2
+
+    def concluir(self, rotulos, flags):
+        inicio = self.f.tell()
+        if flags & ROTULOS_INT:
+            tabela = array("q", rotulos)
+            if sys.byteorder != "little":
+                tabela.byteswap()
+            tabela.tofile(self.f)
+        else:
+            for r in rotulos:
+                dados = r.encode("utf-8")
+                self.f.write(_TAMANHO.pack(len(dados)))
+                self.f.write(dados)
+        fim = self.f.tell()
+        self.f.seek(0)
+        self.f.write(_CABECALHO.pack(MAGIC, VERSAO, flags, len(rotulos), self.m, inicio, fim - inicio))
+        self.f.close()
+
+    def descartar(self):
+        self.f.close()
+        try:
+            os.unlink(self.caminho)
+        except OSError:
+            pass
+
+
+def salvar_binario(grafo, caminho):
+    # Salva qualquer grafo do projeto no formato binário (rótulos str ou int)
+    rotulos, pares = _pares(grafo)
+    rotulos = list(rotulos)
+    flags = _flags_rotulos(rotulos)   # antes de criar o arquivo
+    escritor = _EscritorBinario(caminho)
+    try:
+        escritor.escrever(pares)
+        escritor.concluir(rotulos, flags)
+    except BaseException:
+        escritor.descartar()
+        raise
+
+
+def texto_para_binario(arquivo, caminho, separador=None, converter=None):
+    """
+    Converte uma lista de arestas em texto direto para o formato binário,
+    numa única passada e sem montar o grafo: os rótulos recebem índices na
+    ordem em que aparecem. Se a leitura falhar, o arquivo de destino não
+    é criado.
+    """
+    indice = {}
+    escritor = _EscritorBinario(caminho)
+    try:
+        for lote in ler_arestas(arquivo, separador, converter=converter):
+            pares = []
+            for u, v in lote:
+                i = indice.setdefault(u, len(indice))
+                j = indice.setdefault(v, len(indice))
+                pares.append((i, j))
+            escritor.escrever(pares)
+        rotulos = list(indice)
+        escritor.concluir(rotulos, _flags_rotulos(rotulos))
+    except BaseException:
+        escritor.descartar()
+        raise
+
+
+# ==========================
+# LEITURA DO FORMATO BINÁRIO (MMAP)
+# ==========================
+class GrafoBinario:
+    """
+    Grafo aberto de um arquivo binário via mmap. As arestas não são
+    copiadas: `pares` é uma memoryview int32 sobre o arquivo, e `origens`/
+    `destinos` são fatias dela. Só a tabela de rótulos é decodificada.
+    Use como gerenciador de contexto ou chame fechar().
+    """
+
+    def __init__(self, caminho):
+        with open(caminho, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, versao, flags, n, m, inicio, tamanho = _CABECALHO.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError("arquivo não está no formato GRAFOBIN")
+        if versao != VERSAO:
+            self._mmap.close()
+            raise ValueError(f"versão {versao} do formato não suportada")
+        self.n = n
+        self.m = m
+        self._bruto = memoryview(self._mmap)
+        fatia = self._bruto[_CABECALHO.size:_CABECALHO.size + 8 * m]
+        if sys.byteorder == "little":
+            self.pares = fatia.cast("i")
+        else:   # sem cópia zero em máquinas big-endian
+            copia = array("i", fatia.tobytes())
+            copia.byteswap()
+            self.pares = memoryview(copia)
+        fatia.release()
+        self.origens = self.pares[0::2]
+        self.destinos = self.pares[1::2]
+        self.rotulos = self._ler_rotulos(flags, inicio, tamanho)
+
+    def _ler_rotulos(self, flags, inicio, tamanho):
+        if flags & ROTULOS_INT:
+            tabela = array("q", self._mmap[inicio:inicio + tamanho])
+            if sys.byteorder != "little":
+                tabela.byteswap()
+            return tabela.tolist()
+        rotulos = []
+        pos = inicio
+        for _ in range(self.n):
+            (k,) = _TAMANHO.unpack_from(self._mmap, pos)
+            pos += _TAMANHO.size
+            rotulos.append(self._mmap[pos:pos + k].decode("utf-8"))
+            pos += k
+        return rotulos
+
+    def arestas(self, tamanho_lote=65536):
+        # lotes de pares de rótulos, prontos para adicionar_arestas
+        rotulos, pares = self.rotulos, self.pares
+        for ini in range(0, 2 * self.m, 2 * tamanho_lote):
+            bloco = pares[ini:ini + 2 * tamanho_lote].tolist()
+            yield [(rotulos[bloco[k]], rotulos[bloco[k + 1]]) for k in range(0, len(bloco), 2)]
+
+    def construir(self, classe, tamanho_lote=65536):
+        return _construir(classe, list(self.rotulos), self.arestas(tamanho_lote))
+
+    def fechar(self):
+        for visao in (self.origens, self.destinos, self.pares, self._bruto):
+            visao.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def abrir_binario(caminho):
+    return GrafoBinario(caminho)